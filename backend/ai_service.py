@@ -1,11 +1,20 @@
 import os
-import json
-from typing import List
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, List, Optional, Tuple, Type
 from dotenv import load_dotenv
 from google import genai
-from sqlmodel import Session, select
-from .database import User, Log, PracticeStatus
-from .schemas import RecommendationRequest, RecommendationResponse, RecommendedProblem
+from google.genai import types
+from pydantic import BaseModel, ValidationError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .database import async_engine, insert_for, User, Log, PracticeStatus, RecommendationCount
+from .schemas import RecommendationRequest, RecommendationResponse, RecommendedProblem, ProblemHints
+from .config import GEMINI_MODEL, AI_MAX_CONCURRENCY, AI_MAX_QUEUE, AI_QUEUE_TIMEOUT_SECONDS
+from .utils.singleflight import AsyncSingleFlight
+from .utils.resilience import ConcurrencyLimiter, LimiterRejected
+from .utils.json_stream import JsonObjectStream, parse_object
+from . import stats, hint_cache
 
 # Load environment variables
 load_dotenv()
@@ -17,8 +26,157 @@ if not api_key:
 
 client = genai.Client(api_key=api_key)
 
+# Keeps slow Gemini calls from piling up: excess callers get 429/503
+_limiter = ConcurrencyLimiter(AI_MAX_CONCURRENCY, AI_MAX_QUEUE, AI_QUEUE_TIMEOUT_SECONDS)
 
-def get_user_history_summary(session: Session, user_id: int) -> str:
+# Bump when the hint prompt changes so cached hints are regenerated
+HINT_PROMPT_VERSION = "1"
+
+# How each structured response parsed, per kind ("recommendations", "hints"):
+# "parsed" (valid JSON), "salvaged" (usable items recovered), "failed" (call wasted)
+_output_stats: Counter = Counter()
+
+# Concurrent requests for the same uncached hints share one generation
+_hint_flights = AsyncSingleFlight()
+
+HINT_COUNT = 3
+
+FALLBACK_HINTS = [
+    "Start by understanding the input and output requirements clearly.",
+    "Think about which data structure (array, hash map, stack, etc.) fits this problem.",
+    "Consider edge cases and how your solution handles them."
+]
+
+
+def _json_config(response_schema: Optional[Type[BaseModel]]) -> Optional[types.GenerateContentConfig]:
+    """Constrain the response to JSON matching the schema (no config if None)."""
+    if response_schema is None:
+        return None
+    return types.GenerateContentConfig(
+        response_mime_type="application/json",
+        response_schema=response_schema
+    )
+
+
+async def generate_content(prompt: str, response_schema: Optional[Type[BaseModel]] = None):
+    """
+    Call Gemini through the async client, within the concurrency limit.
+    
+    Args:
+        prompt: Prompt text
+        response_schema: Pydantic model the JSON response must follow, if any
+    
+    Returns:
+        The model response
+    
+    Raises:
+        LimiterRejected: If too many AI calls are already running or queued
+    """
+    async with _limiter.slot():
+        return await client.aio.models.generate_content(
+            model=GEMINI_MODEL,
+            contents=prompt,
+            config=_json_config(response_schema)
+        )
+
+
+def stream_content(prompt: str, response_schema: Optional[Type[BaseModel]] = None) -> AsyncIterator[str]:
+    """
+    Prepare a streaming Gemini call within the concurrency limit.
+    
+    A full queue is reported here, before any response is streamed. The slot
+    itself is only taken once the returned iterator is first read and is
+    released when it is exhausted or closed, so an iterator that is never
+    read holds nothing.
+    
+    Args:
+        prompt: Prompt text
+        response_schema: Pydantic model the JSON response must follow, if any
+    
+    Returns:
+        Async iterator over the response text chunks (raises LimiterRejected
+        if no slot frees up in time)
+    
+    Raises:
+        LimiterRejected: If too many AI calls are already running and queued
+    """
+    _limiter.check()
+
+    async def chunks() -> AsyncIterator[str]:
+        async with _limiter.slot():
+            stream = await client.aio.models.generate_content_stream(
+                model=GEMINI_MODEL,
+                contents=prompt,
+                config=_json_config(response_schema)
+            )
+            async for chunk in stream:
+                if chunk.text:
+                    yield chunk.text
+
+    return chunks()
+
+
+def get_status() -> dict:
+    """Current state of the AI call limiter and structured output parse counts."""
+    return {"limiter": _limiter.snapshot(), "structured_output": dict(_output_stats)}
+
+
+def _parse_response(kind: str, response, items_key: str) -> Tuple[dict, bool]:
+    """
+    Read a schema-constrained response, salvaging the complete items of a
+    truncated or malformed one instead of discarding the whole call.
+    
+    Args:
+        kind: Stats key ("recommendations" or "hints")
+        response: Model response
+        items_key: Name of the array holding the items
+    
+    Returns:
+        (members, complete): members is empty if nothing usable was found;
+        complete is False when they were salvaged
+    """
+    data, complete = parse_object(response.text or "")
+    if complete:
+        outcome = "parsed"
+    elif data.get(items_key):
+        outcome = "salvaged"
+        print(f"Salvaged {len(data[items_key])} {kind} item(s) from malformed model output")
+    else:
+        outcome = "failed"
+        print(f"Unusable {kind} model output: {(response.text or '')[:200]!r}")
+    _output_stats[f"{kind}.{outcome}"] += 1
+    return data, complete
+
+
+def _record_stream_outcome(kind: str, complete: bool, item_count: int) -> None:
+    """Count a streamed response in the same buckets as _parse_response."""
+    if complete:
+        outcome = "parsed"
+    elif item_count:
+        outcome = "salvaged"
+    else:
+        outcome = "failed"
+    _output_stats[f"{kind}.{outcome}"] += 1
+
+
+def _busy_event(exc: LimiterRejected) -> dict:
+    """Error event data for a stream whose AI call was turned away (mirrors the 429/503 handler)."""
+    return {
+        "detail": f"The AI coach is busy, please try again shortly ({exc})",
+        "status": 429 if exc.queue_full else 503
+    }
+
+
+def _to_recommendation(item: Any) -> Optional[RecommendedProblem]:
+    """Validate one recommended problem, dropping it if malformed."""
+    try:
+        return RecommendedProblem(**item)
+    except (TypeError, ValidationError) as e:
+        print(f"   🗑️ DROP: malformed recommendation ({e})")
+        return None
+
+
+async def get_user_history_summary(session: AsyncSession, user_id: int) -> str:
     """
     Get a summary of the user's practice history.
     
@@ -36,7 +194,7 @@ def get_user_history_summary(session: Session, user_id: int) -> str:
         .order_by(Log.practice_date.desc())
         .limit(20)
     )
-    logs = session.exec(statement).all()
+    logs = (await session.exec(statement)).all()
     
     if not logs:
         return "No practice history available."
@@ -61,23 +219,25 @@ def get_user_history_summary(session: Session, user_id: int) -> str:
             if log.note:
                 summary_parts.append(f"  Note: {log.note}")
     
-    # Add topics that appear frequently in struggles
-    if struggled_logs:
-        all_tags = []
-        for log in struggled_logs:
-            all_tags.extend([tag.strip() for tag in log.tags.split(",")])
-        
-        from collections import Counter
-        tag_counts = Counter(all_tags)
-        if tag_counts:
-            summary_parts.append("\nMost challenging topics:")
-            for tag, count in tag_counts.most_common(5):
-                summary_parts.append(f"- {tag}: {count} times")
+    # Weakest topics over the whole history, from the per-tag statistics
+    tag_stats = await stats.get_tag_stats(session, user_id)
+    struggled_tags = [
+        (name, stat) for name, stat in tag_stats
+        if stat.with_hint_count or stat.stuck_count
+    ]
+    if struggled_tags:
+        summary_parts.append("\nMost challenging topics:")
+        struggled_tags.sort(key=lambda item: stats.current_score(item[1]))
+        for name, stat in struggled_tags[:5]:
+            summary_parts.append(
+                f"- {name}: stuck {stat.stuck_count}, needed hints {stat.with_hint_count}, "
+                f"independent {stat.independent_count} of {stat.attempts} attempts"
+            )
 
     return "\n".join(summary_parts)
 
 
-def get_mastered_problems(session: Session, user_id: int) -> set[str]:
+async def get_mastered_problems(session: AsyncSession, user_id: int) -> set[str]:
     """
     Get a normalized set of problem titles the user has mastered.
 
@@ -89,7 +249,7 @@ def get_mastered_problems(session: Session, user_id: int) -> set[str]:
         .where(Log.status == PracticeStatus.INDEPENDENT)
         .where(Log.is_deleted == False)
     )
-    logs = session.exec(statement).all()
+    logs = (await session.exec(statement)).all()
 
     return {
         (log.problem_title or "").strip().lower()
@@ -98,25 +258,14 @@ def get_mastered_problems(session: Session, user_id: int) -> set[str]:
     }
 
 
-def generate_recommendations(
-    session: Session, 
-    request: RecommendationRequest, 
-    user_id: int
-) -> RecommendationResponse:
-    """
-    Generate AI-powered problem recommendations based on user history.
-    
-    Args:
-        session: Database session
-        request: Recommendation request with tags, difficulty, and count
-        user_id: User ID
-    
-    Returns:
-        RecommendationResponse with advice and recommended problems
-    """
-    # Get user history summary
-    history_summary = get_user_history_summary(session, user_id)
-    
+def _candidate_count(request: RecommendationRequest) -> int:
+    """Candidates to ask for, leaving room for filtering out solved problems."""
+    return 2 * request.count + 10
+
+
+def _recommendations_prompt(request: RecommendationRequest, history_summary: str) -> str:
+    fetch_count = _candidate_count(request)
+
     # Convert tags to string list
     tags_str = ", ".join([tag.value for tag in request.tags])
     
@@ -133,9 +282,7 @@ def generate_recommendations(
     else:
         company_context = "Focus on high-value problems for general top-tier tech interviews."
 
-    fetch_count = 2 *request.count + 10
-
-    prompt = f"""
+    return f"""
 ROLE: You are an expert coding interview coach.
 CONTEXT:
 User's Skill Level: {history_summary}
@@ -178,85 +325,125 @@ IMPORTANT: The Topic must ALWAYS match the requested topics. Do not recommend ou
 
 IMPORTANT: Return ONLY the JSON object, nothing else."""
 
-    try:
-        # Generate response from Gemini
-        response = client.models.generate_content(
-            model='gemini-flash-lite-latest',
-            contents=prompt
-        )
-        
-        response_text = response.text.strip()
-        
-        # Remove markdown code blocks if present
-        if response_text.startswith("```"):
-            # Remove first and last lines
-            lines = response_text.split("\n")
-            response_text = "\n".join(lines[1:-1])
-        
-        # Parse JSON
-        data = json.loads(response_text)
-        
-        # Convert to Pydantic models
-        recommendations = [
-            RecommendedProblem(**problem)
-            for problem in data.get("recommendations", [])
-        ]
 
-        mastered_titles = get_mastered_problems(session, user_id)
-        exclude_titles = {
+class RecommendationFilter:
+    """
+    Picks the recommendations to show from the model's candidates: drops wrong
+    difficulties, problems the user has mastered, and problems already seen
+    this session, and stops at the requested count.
+    """
+
+    def __init__(self, request: RecommendationRequest, mastered_titles: set[str]):
+        self.request = request
+        self.mastered_titles = mastered_titles
+        self.exclude_titles = {
             (title or "").strip().lower()
             for title in (request.exclude_problems or [])
             if title
         }
-        blocked_titles = mastered_titles | exclude_titles
-        print(f"\n🔍 --- DEBUG START: User {user_id} ---")
-        print(f"🎯 Goal: {request.count} | Buffer: {fetch_count}")
-        print(f"🚫 Blacklist Size: {len(mastered_titles) + len(exclude_titles)}")
-        print(f"🧠 Mastered: {len(mastered_titles)} | Seen in Session: {len(exclude_titles)}")
-        print(f"✨ AI returned {len(recommendations)} candidates.")
+        self.kept: List[RecommendedProblem] = []
 
-        valid_recommendations: List[RecommendedProblem] = []
-        for problem in recommendations:
-            ai_title_norm = (problem.title or "").strip().lower()
+    @property
+    def done(self) -> bool:
+        return len(self.kept) >= self.request.count
+
+    def accept(self, problem: RecommendedProblem) -> bool:
+        """Keep the problem if it passes the filters and the count isn't reached yet."""
+        if self.done:
+            return False
+
+        ai_title_norm = (problem.title or "").strip().lower()
+
+        req_diff = (self.request.difficulty.value if self.request.difficulty else "Adaptive").lower().strip()
+        prob_diff = (problem.difficulty or "").lower().strip()
+        if req_diff not in ["adaptive", "mixed", "any"]:
+            if prob_diff != req_diff:
+                print(f"   🗑️ DROP: '{problem.title}' (Wrong Difficulty: {problem.difficulty})")
+                return False
+
+        if ai_title_norm in self.mastered_titles:
+            print(f"   ❌ SKIP: '{problem.title}' (Already Mastered)")
+            return False
 
-            req_diff = (request.difficulty.value if request.difficulty else "Adaptive").lower().strip()
-            prob_diff = (problem.difficulty or "").lower().strip()
-            if req_diff not in ["adaptive", "mixed", "any"]:
-                if prob_diff != req_diff:
-                    print(f"   🗑️ DROP: '{problem.title}' (Wrong Difficulty: {problem.difficulty})")
-                    continue
+        if ai_title_norm in self.exclude_titles:
+            print(f"   ❌ SKIP: '{problem.title}' (Seen in Session)")
+            return False
 
-            if ai_title_norm in mastered_titles:
-                print(f"   ❌ SKIP: '{problem.title}' (Already Mastered)")
-                continue
+        print(f"   ✅ KEEP: '{problem.title}'")
+        self.kept.append(problem)
+
+        if self.done:
+            print("   🛑 Limit reached, stopping.")
+        return True
+
+
+async def generate_recommendations(
+    session: AsyncSession, 
+    request: RecommendationRequest, 
+    user_id: int
+) -> RecommendationResponse:
+    """
+    Generate AI-powered problem recommendations based on user history.
+    
+    Args:
+        session: Database session
+        request: Recommendation request with tags, difficulty, and count
+        user_id: User ID
+    
+    Returns:
+        RecommendationResponse with advice and recommended problems
+    """
+    # Get user history summary
+    history_summary = await get_user_history_summary(session, user_id)
+    prompt = _recommendations_prompt(request, history_summary)
 
-            if ai_title_norm in exclude_titles:
-                print(f"   ❌ SKIP: '{problem.title}' (Seen in Session)")
-                continue
+    try:
+        # Generate response from Gemini
+        response = await generate_content(prompt, response_schema=RecommendationResponse)
+        data, _ = _parse_response("recommendations", response, "recommendations")
+        if not data.get("recommendations"):
+            # Return fallback response
+            return RecommendationResponse(
+                advice="Unable to generate personalized recommendations. Please try again.",
+                recommendations=[]
+            )
+        
+        # Convert to Pydantic models, skipping malformed items
+        recommendations = [
+            problem
+            for problem in map(_to_recommendation, data["recommendations"])
+            if problem is not None
+        ]
 
-            print(f"   ✅ KEEP: '{problem.title}'")
-            valid_recommendations.append(problem)
+        mastered_titles = await get_mastered_problems(session, user_id)
+        recommendation_filter = RecommendationFilter(request, mastered_titles)
+        print(f"\n🔍 --- DEBUG START: User {user_id} ---")
+        print(f"🎯 Goal: {request.count} | Buffer: {_candidate_count(request)}")
+        print(f"🚫 Blacklist Size: {len(mastered_titles) + len(recommendation_filter.exclude_titles)}")
+        print(f"🧠 Mastered: {len(mastered_titles)} | Seen in Session: {len(recommendation_filter.exclude_titles)}")
+        print(f"✨ AI returned {len(recommendations)} candidates.")
 
-            if len(valid_recommendations) >= request.count:
-                print("   🛑 Limit reached, stopping.")
+        for problem in recommendations:
+            recommendation_filter.accept(problem)
+            if recommendation_filter.done:
                 break
+        valid_recommendations = recommendation_filter.kept
 
         print(f"📊 Final Count: {len(valid_recommendations)}/{request.count}")
         print("----------------------------------\n")
+
+        try:
+            await record_recommendations(session, valid_recommendations)
+        except Exception as e:
+            print(f"Error recording recommendations: {e}")
         
         return RecommendationResponse(
-            advice=data.get("advice", "Keep practicing consistently!"),
+            advice=data.get("advice") or "Keep practicing consistently!",
             recommendations=valid_recommendations
         )
     
-    except json.JSONDecodeError as e:
-        print(f"JSON parsing error: {e}")
-        print(f"Response text: {response_text}")
-        # Return fallback response
-        return RecommendationResponse(
-            advice="Unable to generate personalized recommendations. Please try again.",
-            recommendations=[]
-        )
+    except LimiterRejected:
+        raise
     except Exception as e:
         print(f"Error generating recommendations: {e}")
         # Return fallback response
@@ -265,17 +452,228 @@ IMPORTANT: Return ONLY the JSON object, nothing else."""
             recommendations=[]
         )
 
-def get_problem_hints(problem_title: str) -> dict:
+
+async def stream_recommendations(
+    session: AsyncSession,
+    request: RecommendationRequest,
+    user_id: int
+) -> AsyncIterator[Tuple[str, dict]]:
     """
-    Generate 3 progressive hints for a LeetCode problem.
+    Stream recommendations: the advice and each kept recommendation are
+    emitted as soon as the model has finished writing them.
+    
+    A full AI call queue raises LimiterRejected here rather than mid-stream.
+    
+    Args:
+        session: Database session (only used before streaming starts)
+        request: Recommendation request with tags, difficulty, and count
+        user_id: User ID
+    
+    Returns:
+        Async iterator of (event, data) pairs: "advice", "recommendation",
+        then "done" (or "error")
+    
+    Raises:
+        LimiterRejected: If too many AI calls are already running or queued
+    """
+    history_summary = await get_user_history_summary(session, user_id)
+    mastered_titles = await get_mastered_problems(session, user_id)
+    chunks = stream_content(
+        _recommendations_prompt(request, history_summary),
+        response_schema=RecommendationResponse
+    )
+
+    async def events() -> AsyncIterator[Tuple[str, dict]]:
+        recommendation_filter = RecommendationFilter(request, mastered_titles)
+        parser = JsonObjectStream()
+        advice = None
+        ended = False
+        print(f"\n🔍 --- STREAM START: User {user_id} ---")
+        try:
+            async for text in chunks:
+                for kind, key, value in parser.feed(text):
+                    if kind == "field" and key == "advice" and isinstance(value, str):
+                        advice = value
+                        yield "advice", {"advice": advice}
+                    elif kind == "item" and key == "recommendations":
+                        problem = _to_recommendation(value)
+                        if problem is not None and recommendation_filter.accept(problem):
+                            yield "recommendation", problem.model_dump()
+                if recommendation_filter.done:
+                    break
+            ended = True
+        except LimiterRejected as e:
+            # No slot: report overload instead of an empty result
+            print(f"Recommendation stream rejected: {e}")
+            yield "error", _busy_event(e)
+            return
+        except Exception as e:
+            print(f"Error streaming recommendations: {e}")
+            yield "error", {"detail": "An error occurred while generating recommendations. Please try again later."}
+        finally:
+            await chunks.aclose()
+
+        complete = ended and (parser.closed or recommendation_filter.done) and not parser.errors
+        _record_stream_outcome("recommendations", complete, len(parser.fields.get("recommendations", [])))
+        print(f"📊 Final Count: {len(recommendation_filter.kept)}/{request.count}")
+        if advice is None:
+            yield "advice", {"advice": "Keep practicing consistently!"}
+        yield "done", {"count": len(recommendation_filter.kept)}
+
+        try:
+            async with AsyncSession(async_engine) as record_session:
+                await record_recommendations(record_session, recommendation_filter.kept)
+        except Exception as e:
+            print(f"Error recording recommendations: {e}")
+
+    return events()
+
+
+async def record_recommendations(session: AsyncSession, problems: List[RecommendedProblem]) -> None:
+    """
+    Count how often each problem is recommended (used to pick problems for
+    hint pre-generation).
+    
+    Args:
+        session: Database session (committed here)
+        problems: Recommendations shown to the user
+    """
+    if not problems:
+        return
+
+    now = datetime.now(timezone.utc)
+    insert = insert_for(session)
+    for problem in problems:
+        statement = insert(RecommendationCount).values(
+            problem_id=str(problem.problem_id),
+            title=problem.title,
+            count=1,
+            last_recommended_at=now
+        )
+        await session.exec(statement.on_conflict_do_update(
+            index_elements=["problem_id"],
+            set_={
+                "title": problem.title,
+                "count": RecommendationCount.count + 1,
+                "last_recommended_at": now
+            }
+        ))
+    await session.commit()
+
+
+async def get_problem_hints(
+    problem_title: str,
+    problem_id: Optional[int] = None,
+    regenerate: bool = False
+) -> dict:
+    """
+    Get 3 progressive hints for a LeetCode problem, from the hint cache if possible.
     
     Args:
         problem_title: Title of the LeetCode problem
+        problem_id: Frontend problem ID, used as the cache key when given
+        regenerate: Skip the cache and replace its entry with fresh hints
     
     Returns:
-        Dictionary with list of 3 hints
+        Dictionary with list of 3 hints and whether they came from the cache
+    """
+    key = hint_cache.problem_key(problem_title, problem_id)
+    if not regenerate:
+        hints = await hint_cache.get(key, HINT_PROMPT_VERSION, GEMINI_MODEL)
+        if hints:
+            return {"hints": hints, "cached": True}
+
+    hints = await _hint_flights.do(key, lambda: _generate_and_cache_hints(key, problem_title))
+    if not hints:
+        return {"hints": FALLBACK_HINTS, "cached": False}
+    return {"hints": hints, "cached": False}
+
+
+async def stream_problem_hints(
+    problem_title: str,
+    problem_id: Optional[int] = None,
+    regenerate: bool = False
+) -> AsyncIterator[Tuple[str, dict]]:
+    """
+    Stream 3 progressive hints, each emitted as soon as the model has written it.
+    
+    Cached hints are emitted at once. Otherwise a full AI call queue raises
+    LimiterRejected here rather than mid-stream, and the hints are cached
+    when the stream completes.
+    
+    Args:
+        problem_title: Title of the LeetCode problem
+        problem_id: Frontend problem ID, used as the cache key when given
+        regenerate: Skip the cache and replace its entry with fresh hints
+    
+    Returns:
+        Async iterator of (event, data) pairs: "hint" per hint, then "done"
+        ("error" instead if no AI call slot frees up in time)
+    
+    Raises:
+        LimiterRejected: If too many AI calls are already running or queued
     """
-    prompt = f"""You are an expert LeetCode coach. Provide 3 progressive hints for solving this LeetCode problem: "{problem_title}"
+    key = hint_cache.problem_key(problem_title, problem_id)
+    cached = None if regenerate else await hint_cache.get(key, HINT_PROMPT_VERSION, GEMINI_MODEL)
+    chunks = None if cached else stream_content(_hints_prompt(problem_title), response_schema=ProblemHints)
+
+    async def events() -> AsyncIterator[Tuple[str, dict]]:
+        if cached:
+            for index, hint in enumerate(cached):
+                yield "hint", {"index": index, "hint": hint}
+            yield "done", {"cached": True}
+            return
+
+        parser = JsonObjectStream()
+        hints: List[str] = []
+        ended = False
+        try:
+            async for text in chunks:
+                for kind, field, value in parser.feed(text):
+                    if kind == "item" and field == "hints":
+                        hints.append(str(value))
+                        yield "hint", {"index": len(hints) - 1, "hint": hints[-1]}
+            ended = True
+        except LimiterRejected as e:
+            # No slot: report overload instead of passing off the generic hints
+            print(f"Hint stream rejected: {e}")
+            yield "error", _busy_event(e)
+            return
+        except Exception as e:
+            print(f"Error streaming hints: {e}")
+        finally:
+            await chunks.aclose()
+
+        # Only a whole, well-formed set of hints is cached
+        complete = ended and parser.closed and not parser.errors and len(hints) == HINT_COUNT
+        _record_stream_outcome("hints", complete, len(hints))
+        if complete:
+            try:
+                await hint_cache.put(key, HINT_PROMPT_VERSION, GEMINI_MODEL, hints)
+            except Exception as e:
+                print(f"Error caching hints: {e}")
+        else:
+            # Fill in the tiers the model didn't deliver
+            for index in range(len(hints), HINT_COUNT):
+                yield "hint", {"index": index, "hint": FALLBACK_HINTS[index]}
+        yield "done", {"cached": False}
+
+    return events()
+
+
+async def _generate_and_cache_hints(key: str, problem_title: str) -> Optional[List[str]]:
+    hints, complete = await _generate_hints(problem_title)
+    if not hints:
+        return None
+    if complete:
+        await hint_cache.put(key, HINT_PROMPT_VERSION, GEMINI_MODEL, hints)
+        return hints
+    # Salvaged hints are served once, padded with the generic tiers, never cached
+    return hints[:HINT_COUNT] + FALLBACK_HINTS[len(hints):]
+
+
+def _hints_prompt(problem_title: str) -> str:
+    return f"""You are an expert LeetCode coach. Provide 3 progressive hints for solving this LeetCode problem: "{problem_title}"
 
 The hints should be:
 1. Hint 1: High-level conceptual approach (no code, just the general strategy)
@@ -294,37 +692,44 @@ Return your response in PURE JSON format (no markdown, no code blocks) with this
 IMPORTANT: Return ONLY the JSON object, nothing else.
 The output strings in the JSON array must contain ONLY the hint content. Do NOT include labels like 'Hint 1:' or 'Step 1:' at the beginning of the text."""
 
+
+async def generate_problem_hints(problem_title: str) -> Optional[List[str]]:
+    """
+    Generate 3 progressive hints for a LeetCode problem with Gemini.
+    
+    Args:
+        problem_title: Title of the LeetCode problem
+    
+    Returns:
+        List of 3 hints, or None if generation failed or the response was incomplete
+    """
+    hints, complete = await _generate_hints(problem_title)
+    return hints if complete else None
+
+
+async def _generate_hints(problem_title: str) -> Tuple[Optional[List[str]], bool]:
+    """
+    Generate hints, keeping those salvaged from an incomplete response.
+    
+    Returns:
+        (hints, complete): complete only for a well-formed response with
+        exactly HINT_COUNT hints
+    """
+    prompt = _hints_prompt(problem_title)
+
     try:
         # Generate response from Gemini
-        response = client.models.generate_content(
-            model='gemini-flash-lite-latest',
-            contents=prompt
-        )
-        response_text = response.text.strip()
-        
-        # Remove markdown code blocks if present
-        if response_text.startswith("```"):
-            lines = response_text.split("\n")
-            response_text = "\n".join(lines[1:-1])
-        
-        # Parse JSON
-        data = json.loads(response_text)
-        
-        return {
-            "hints": data.get("hints", [
-                "Try breaking down the problem into smaller steps.",
-                "Consider what data structure would help you track information efficiently.",
-                "Think about the time complexity of your approach."
-            ])
-        }
+        response = await generate_content(prompt, response_schema=ProblemHints)
+        data, complete = _parse_response("hints", response, "hints")
+        hints = data.get("hints")
+        if not isinstance(hints, list) or not hints:
+            print(f"No hints in model response for '{problem_title}'")
+            return None, False
+        hints = [str(hint) for hint in hints]
+        return hints, complete and len(hints) == HINT_COUNT
     
+    except LimiterRejected:
+        raise
     except Exception as e:
         print(f"Error generating hints: {e}")
-        # Return fallback hints
-        return {
-            "hints": [
-                "Start by understanding the input and output requirements clearly.",
-                "Think about which data structure (array, hash map, stack, etc.) fits this problem.",
-                "Consider edge cases and how your solution handles them."
-            ]
-        }
+        return None, False
@@ -0,0 +1,374 @@
+"""
+Local LeetCode problem catalog.
+
+Problem metadata fetched from LeetCode is persisted in the Problem table so
+repeated lookups are served from the database instead of the network.
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, List
+from sqlmodel import Session, select, update, delete
+from .database import engine, Problem, ProblemTag, Log, CatalogSync, set_problem_tags
+from .config import CATALOG_TTL_HOURS
+from .utils.dates import as_utc
+from . import stats
+
+
+# In-memory bidirectional index between frontend IDs and slugs.
+# The Problem table (indexed on both columns) is the on-disk copy.
+_slug_by_id: Dict[str, str] = {}
+_id_by_slug: Dict[str, str] = {}
+_index_lock = threading.Lock()
+_index_loaded = False
+
+# Time of the last problemset sync, re-read now and then (the sync may run
+# in another process)
+_SYNCED_AT_RECHECK_SECONDS = 60
+_synced_at: Optional[datetime] = None
+_synced_at_checked = 0.0
+
+
+def _within_ttl(value: datetime) -> bool:
+    return datetime.now(timezone.utc) - as_utc(value) < timedelta(hours=CATALOG_TTL_HOURS)
+
+
+def _check_synced_at(session: Session) -> None:
+    """Refresh the cached problemset sync time if it hasn't been read lately."""
+    global _synced_at, _synced_at_checked
+    if time.monotonic() - _synced_at_checked < _SYNCED_AT_RECHECK_SECONDS:
+        return
+    sync = session.get(CatalogSync, 1)
+    _synced_at = sync.synced_at if sync else None
+    _synced_at_checked = time.monotonic()
+
+
+def needs_sync() -> bool:
+    """
+    Check whether the whole problemset should be (re)synced.
+
+    Returns:
+        True if no problemset sync was recorded or the last one is older
+        than CATALOG_TTL_HOURS
+    """
+    with Session(engine) as session:
+        sync = session.get(CatalogSync, 1)
+    return sync is None or not _within_ttl(sync.synced_at)
+
+
+def is_fresh(problem: Problem) -> bool:
+    """
+    Check whether a catalog entry is still within its TTL.
+
+    Args:
+        problem: Catalog entry
+
+    Returns:
+        True if the entry was fetched, or confirmed by a problemset sync,
+        less than CATALOG_TTL_HOURS ago
+    """
+    if _within_ttl(problem.fetched_at):
+        return True
+    return problem.listed and _synced_at is not None and _within_ttl(_synced_at)
+
+
+def to_problem_info(problem: Problem) -> Dict[str, str]:
+    """Convert a catalog entry to the dictionary shape returned by the scraper."""
+    return {
+        "problem_id": problem.frontend_id or "",
+        "title": problem.title,
+        "difficulty": problem.difficulty,
+        "tags": problem.tags
+    }
+
+
+def _retire_problem(session: Session, problem: Problem, new_slug: str) -> None:
+    """Delete a catalog entry whose ID moved to new_slug, repointing its logs."""
+    session.exec(delete(ProblemTag).where(ProblemTag.problem_slug == problem.slug))
+    session.exec(update(Log).where(Log.problem_slug == problem.slug).values(problem_slug=new_slug))
+    session.delete(problem)
+
+
+def get_problem(title_slug: str) -> Optional[Problem]:
+    """
+    Look up a problem in the local catalog.
+
+    Args:
+        title_slug: The URL slug of the LeetCode problem
+
+    Returns:
+        The catalog entry (fresh or stale), or None if it was never fetched
+    """
+    with Session(engine) as session:
+        _check_synced_at(session)
+        return session.get(Problem, title_slug)
+
+
+def get_problems(title_slugs: List[str]) -> Dict[str, Problem]:
+    """
+    Look up several problems in the local catalog with one query.
+
+    Args:
+        title_slugs: URL slugs of the LeetCode problems
+
+    Returns:
+        Catalog entries (fresh or stale) by slug; slugs never fetched are left out
+    """
+    if not title_slugs:
+        return {}
+    with Session(engine) as session:
+        _check_synced_at(session)
+        statement = select(Problem).where(Problem.slug.in_(title_slugs))
+        return {problem.slug: problem for problem in session.exec(statement).all()}
+
+
+def save_problems(problems_info: Dict[str, Dict[str, str]]) -> None:
+    """
+    Save several scraped problems (see save_problem).
+
+    Args:
+        problems_info: Problem info by slug
+    """
+    for title_slug, problem_info in problems_info.items():
+        save_problem(title_slug, problem_info)
+
+
+def save_problem(title_slug: str, problem_info: Dict[str, str]) -> None:
+    """
+    Insert or update a catalog entry from scraped problem info.
+
+    Args:
+        title_slug: The URL slug of the LeetCode problem
+        problem_info: Dictionary with problem_id, title, difficulty, and tags
+    """
+    frontend_id = problem_info.get("problem_id") or None
+
+    with Session(engine) as session:
+        # A renamed problem keeps its ID under a new slug; drop the old entry
+        moved = False
+        if frontend_id:
+            statement = select(Problem).where(
+                Problem.frontend_id == frontend_id,
+                Problem.slug != title_slug
+            )
+            for outdated in session.exec(statement).all():
+                _retire_problem(session, outdated, title_slug)
+                moved = True
+            session.flush()
+
+        problem = session.get(Problem, title_slug)
+        if problem is None:
+            problem = Problem(slug=title_slug, title="", difficulty="")
+
+        problem.frontend_id = frontend_id
+        problem.title = problem_info.get("title", "")
+        problem.difficulty = problem_info.get("difficulty", "")
+        problem.tags = problem_info.get("tags", "")
+        problem.fetched_at = datetime.now(timezone.utc)
+
+        session.add(problem)
+        session.flush()
+        # Logs counted under the old tags (or the retired entry's) are recounted
+        if set_problem_tags(session, {title_slug: problem.tags}) or moved:
+            stats.rebuild_for_problems(session, [title_slug])
+        session.commit()
+
+    if frontend_id:
+        remember_slug(frontend_id, title_slug)
+
+
+def sync_problems(problems: List[Dict], full: bool = False) -> Dict[str, int]:
+    """
+    Write a bulk problemset fetch into the catalog in one transaction.
+
+    By default the sync is incremental: only new or changed rows are
+    written. Unchanged rows stay fresh through the catalog-wide sync time
+    (CatalogSync) and their `listed` flag. Tag links are rebuilt for
+    written rows.
+
+    Args:
+        problems: Dictionaries with slug, problem_id, title, difficulty,
+            tags, and paid_only (as returned by scraper.fetch_problemset)
+        full: Rewrite every row even if nothing changed
+
+    Returns:
+        Dictionary with inserted, updated, unchanged, and removed counts
+    """
+    global _synced_at, _synced_at_checked
+    now = datetime.now(timezone.utc)
+    incoming = {p["slug"]: p for p in problems if p.get("slug")}
+    ids = {p["problem_id"]: slug for slug, p in incoming.items() if p.get("problem_id")}
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0, "removed": 0}
+    relink_slugs: List[str] = []
+    moved_to: set[str] = set()
+
+    with Session(engine) as session:
+        existing = {problem.slug: problem for problem in session.exec(select(Problem)).all()}
+
+        # Drop entries whose ID moved to a different slug
+        for problem in list(existing.values()):
+            if problem.frontend_id in ids and ids[problem.frontend_id] != problem.slug:
+                _retire_problem(session, problem, ids[problem.frontend_id])
+                moved_to.add(ids[problem.frontend_id])
+                del existing[problem.slug]
+                counts["removed"] += 1
+        session.flush()
+
+        for slug, info in incoming.items():
+            values = {
+                "frontend_id": info.get("problem_id") or None,
+                "title": info.get("title", ""),
+                "difficulty": info.get("difficulty", ""),
+                "tags": info.get("tags", ""),
+                "paid_only": bool(info.get("paid_only", False)),
+                "listed": True
+            }
+
+            problem = existing.get(slug)
+            if problem is None:
+                session.add(Problem(slug=slug, fetched_at=now, **values))
+                relink_slugs.append(slug)
+                counts["inserted"] += 1
+                continue
+
+            changed = any(getattr(problem, field) != value for field, value in values.items())
+            if not changed and not full:
+                counts["unchanged"] += 1
+                continue
+
+            for field, value in values.items():
+                setattr(problem, field, value)
+            problem.fetched_at = now
+            session.add(problem)
+            relink_slugs.append(slug)
+            counts["updated"] += 1
+
+        # Entries that dropped out of the problemset go stale with their fetched_at
+        for slug, problem in existing.items():
+            if problem.listed and slug not in incoming:
+                problem.listed = False
+                session.add(problem)
+
+        session.flush()
+        changed = set_problem_tags(session, {slug: incoming[slug].get("tags", "") for slug in relink_slugs})
+        stats.rebuild_for_problems(session, set(changed) | moved_to)
+
+        sync = session.get(CatalogSync, 1) or CatalogSync(id=1, synced_at=now)
+        sync.synced_at = now
+        session.add(sync)
+        session.commit()
+
+    _synced_at, _synced_at_checked = now, time.monotonic()
+
+    with _index_lock:
+        for frontend_id, slug in ids.items():
+            _remember(frontend_id, slug)
+
+    return counts
+
+
+def _remember(frontend_id: str, title_slug: str) -> None:
+    """Record an ID/slug pair in both directions. Caller holds _index_lock."""
+    old_slug = _slug_by_id.get(frontend_id)
+    if old_slug and old_slug != title_slug:
+        _id_by_slug.pop(old_slug, None)
+    old_id = _id_by_slug.get(title_slug)
+    if old_id and old_id != frontend_id:
+        _slug_by_id.pop(old_id, None)
+
+    _slug_by_id[frontend_id] = title_slug
+    _id_by_slug[title_slug] = frontend_id
+
+
+def remember_slug(frontend_id: str, title_slug: str) -> None:
+    """
+    Add an ID/slug pair to the in-memory index.
+
+    Args:
+        frontend_id: Frontend question ID (e.g., "1")
+        title_slug: The URL slug of the LeetCode problem (e.g., "two-sum")
+    """
+    with _index_lock:
+        _remember(str(frontend_id), title_slug)
+
+
+def load_index() -> int:
+    """
+    (Re)build the in-memory ID/slug index from the Problem table.
+
+    Returns:
+        Number of indexed problems
+    """
+    global _index_loaded
+
+    with Session(engine) as session:
+        statement = select(Problem.frontend_id, Problem.slug).where(
+            Problem.frontend_id != None
+        )
+        rows = session.exec(statement).all()
+
+    with _index_lock:
+        _slug_by_id.clear()
+        _id_by_slug.clear()
+        for frontend_id, slug in rows:
+            _remember(frontend_id, slug)
+        _index_loaded = True
+
+    return len(rows)
+
+
+def _ensure_index_loaded() -> None:
+    if not _index_loaded:
+        load_index()
+
+
+def get_slug_by_id(frontend_id: str) -> Optional[str]:
+    """
+    Resolve a frontend ID to its slug without touching the network.
+
+    Checks the in-memory index first, then the Problem table (which may have
+    been updated by another process).
+
+    Args:
+        frontend_id: Frontend question ID (e.g., "1")
+
+    Returns:
+        The slug if known locally, otherwise None
+    """
+    frontend_id = str(frontend_id)
+    _ensure_index_loaded()
+
+    slug = _slug_by_id.get(frontend_id)
+    if slug:
+        return slug
+
+    with Session(engine) as session:
+        statement = select(Problem.slug).where(Problem.frontend_id == frontend_id)
+        slug = session.exec(statement).first()
+
+    if slug:
+        remember_slug(frontend_id, slug)
+    return slug
+
+
+def get_id_by_slug(title_slug: str) -> Optional[str]:
+    """
+    Resolve a slug to its frontend ID without touching the network.
+
+    Args:
+        title_slug: The URL slug of the LeetCode problem
+
+    Returns:
+        The frontend ID if known locally, otherwise None
+    """
+    _ensure_index_loaded()
+
+    frontend_id = _id_by_slug.get(title_slug)
+    if frontend_id:
+        return frontend_id
+
+    problem = get_problem(title_slug)
+    if problem and problem.frontend_id:
+        remember_slug(problem.frontend_id, title_slug)
+        return problem.frontend_id
+    return None
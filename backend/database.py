@@ -1,7 +1,24 @@
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Optional, List
-from sqlmodel import Field, SQLModel, create_engine, Session, Relationship
+from typing import Optional, List, Dict, Iterable, Union
+from sqlalchemy import Index, MetaData, Table, event, inspect, literal, func, make_url, update, delete
+from sqlalchemy.dialects import sqlite, postgresql
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .config import (
+    DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT_SECONDS,
+    DB_POOL_RECYCLE_SECONDS,
+    DB_STATEMENT_TIMEOUT_MS,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_SYNCHRONOUS,
+    SQLITE_CACHE_SIZE_KB,
+    SQLITE_MMAP_SIZE,
+    SQLITE_BUSY_TIMEOUT_MS,
+)
+from sqlmodel import Field, SQLModel, create_engine, Session, Relationship, select
 
 
 class PracticeStatus(str, Enum):
@@ -10,6 +27,12 @@ class PracticeStatus(str, Enum):
     STUCK = "STUCK"
 
 
+class EnrichmentStatus(str, Enum):
+    PENDING = "PENDING"  # Problem metadata not fetched yet
+    DONE = "DONE"
+    FAILED = "FAILED"  # Gave up after repeated lookup failures
+
+
 class User(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     username: str = Field(unique=True, index=True)
@@ -20,34 +43,483 @@ class User(SQLModel, table=True):
 
 
 class Log(SQLModel, table=True):
+    __table_args__ = (
+        # History/trash listings and trash purges: filter by user and
+        # is_deleted, ordered by practice_date
+        Index("ix_log_user_deleted_date", "user_id", "is_deleted", "practice_date"),
+        # Attempt numbering: logs of one user for one problem
+        Index("ix_log_user_problem", "user_id", "problem_id"),
+        # Background enrichment: pending logs
+        Index("ix_log_enrichment_status", "enrichment_status"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
     problem_id: str
     problem_title: str
     difficulty: str
-    tags: str  # Store as comma-separated string
     practice_date: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     attempt_count: int = Field(default=1)
     status: PracticeStatus
     note: Optional[str] = None
     time_spent: Optional[int] = None  # Time spent in minutes
     is_deleted: bool = Field(default=False)  # Soft delete flag
+    problem_slug: Optional[str] = None  # References Problem.slug once enriched
+    enrichment_status: EnrichmentStatus = Field(default=EnrichmentStatus.DONE)
+    enrichment_attempts: int = Field(default=0)
     
-    # Relationship
+    # Relationships
     user: Optional[User] = Relationship(back_populates="logs")
+    # No FK constraint: a pending log holds the slug as entered until it is enriched
+    problem: Optional["Problem"] = Relationship(
+        sa_relationship_kwargs={
+            "primaryjoin": "foreign(Log.problem_slug) == Problem.slug",
+            "viewonly": True,
+            "lazy": "selectin"
+        }
+    )
+
+    @property
+    def tags(self) -> str:
+        """Comma-separated tags of the referenced problem."""
+        return self.problem.tags if self.problem else ""
+
+
+class ProblemTag(SQLModel, table=True):
+    """Association between catalog problems and their topic tags."""
+    __table_args__ = (
+        # Per-tag lookups ("all my Graph problems")
+        Index("ix_problemtag_tag", "tag_id"),
+    )
+
+    problem_slug: str = Field(foreign_key="problem.slug", primary_key=True)
+    tag_id: int = Field(foreign_key="tag.id", primary_key=True)
+
+
+class Tag(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str = Field(unique=True, index=True)
+
+    # Relationship
+    problems: List["Problem"] = Relationship(back_populates="topic_tags", link_model=ProblemTag)
+
+
+class Problem(SQLModel, table=True):
+    """Local catalog entry for a LeetCode problem, keyed by its URL slug."""
+    slug: str = Field(primary_key=True)
+    frontend_id: Optional[str] = Field(default=None, unique=True, index=True)
+    title: str
+    difficulty: str
+    tags: str = ""  # Display copy of topic_tags, comma-separated
+    paid_only: bool = Field(default=False)
+    fetched_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))  # Last written from LeetCode
+    listed: bool = Field(default=False)  # Present in the last problemset sync (fresh as of CatalogSync)
+
+    # Relationship
+    topic_tags: List[Tag] = Relationship(back_populates="problems", link_model=ProblemTag)
+
+
+class CatalogSync(SQLModel, table=True):
+    """When the whole problemset was last synced (a single row)."""
+    id: int = Field(default=1, primary_key=True)
+    synced_at: datetime
+
+
+class AttemptCounter(SQLModel, table=True):
+    """Last attempt number handed out per (user, problem)."""
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    problem_id: str = Field(primary_key=True)
+    last_attempt: int = Field(default=0)
+
+
+class UserTagStat(SQLModel, table=True):
+    """Per-user, per-tag practice statistics, maintained as logs are written."""
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    tag_id: int = Field(foreign_key="tag.id", primary_key=True)
+    attempts: int = Field(default=0)
+    independent_count: int = Field(default=0)
+    with_hint_count: int = Field(default=0)
+    stuck_count: int = Field(default=0)
+    last_practiced: Optional[datetime] = None
+    score: float = Field(default=0.0)  # Decayed outcome score as of score_as_of
+    score_as_of: Optional[datetime] = None
+
+
+class HintCacheEntry(SQLModel, table=True):
+    """AI-generated hints for a problem, per prompt version and model."""
+    problem_key: str = Field(primary_key=True)
+    prompt_version: str = Field(primary_key=True)
+    model: str = Field(primary_key=True)
+    hints: str  # JSON array of hint strings
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class RecommendationCount(SQLModel, table=True):
+    """How often each problem has been recommended (ranks hint pre-generation)."""
+    problem_id: str = Field(primary_key=True)  # Frontend ID as given by the model
+    title: str
+    count: int = Field(default=0)
+    last_recommended_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
 # Database setup
-sqlite_url = "sqlite:///solvenext.db"
-engine = create_engine(sqlite_url, connect_args={"check_same_thread": False})
+
+
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    """Apply SQLite pragmas to every new pooled connection."""
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers proceed while a writer is active
+    cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+    # NORMAL skips the fsync per commit in WAL mode (still crash-safe)
+    cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    # Negative cache_size is in KiB
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def _create_engine(database_url: str):
+    """
+    Create the engine for DATABASE_URL.
+
+    SQLite gets per-connection pragmas; server databases (PostgreSQL) get an
+    explicitly sized pool with pre-ping, connection recycling, and a
+    server-side statement timeout.
+    """
+    if make_url(database_url).get_backend_name() == "sqlite":
+        sqlite_engine = create_engine(
+            database_url,
+            connect_args={
+                "check_same_thread": False,
+                "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000
+            }
+        )
+        event.listen(sqlite_engine, "connect", _configure_sqlite_connection)
+        return sqlite_engine
+
+    return create_engine(
+        database_url,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=True,
+        connect_args={"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    )
+
+
+def _async_database_url(database_url: str):
+    """Map DATABASE_URL to an async driver (aiosqlite / asyncpg / psycopg)."""
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    if url.get_backend_name() == "postgresql" and url.get_driver_name() != "psycopg":
+        return url.set(drivername="postgresql+asyncpg")
+    return url
+
+
+def _create_async_engine(database_url: str):
+    """Create the async engine used by request handlers, tuned like _create_engine."""
+    url = _async_database_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        sqlite_engine = create_async_engine(
+            url,
+            connect_args={"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}
+        )
+        event.listen(sqlite_engine.sync_engine, "connect", _configure_sqlite_connection)
+        return sqlite_engine
+
+    if url.get_driver_name() == "asyncpg":
+        connect_args = {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+    else:
+        connect_args = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+
+    return create_async_engine(
+        url,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=True,
+        connect_args=connect_args
+    )
+
+
+# Sync engine: startup, CLI jobs, and background threads (catalog refresh)
+engine = _create_engine(DATABASE_URL)
+
+# Async engine: request handlers and the enrichment worker
+async_engine = _create_async_engine(DATABASE_URL)
 
 
 def create_db_and_tables():
     """Create database tables"""
     SQLModel.metadata.create_all(engine)
+    upgrade_schema()
+
+
+def upgrade_schema():
+    """
+    Bring tables created by older versions up to date.
+
+    create_all only creates missing tables, so columns and indexes added to
+    existing models since are added here (columns with their defaults).
+    """
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        for table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+
+                if hasattr(column.type, "create"):
+                    column.type.create(conn, checkfirst=True)  # e.g. native enum types
+
+                quote = conn.dialect.identifier_preparer.quote
+                column_type = column.type.compile(dialect=conn.dialect)
+                ddl = f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}"
+                if column.default is not None and column.default.is_scalar:
+                    default = column.default.arg
+                    if isinstance(default, Enum):
+                        default = default.name  # Enum columns store member names
+                    ddl += " DEFAULT " + str(
+                        literal(default).compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+                    )
+                conn.exec_driver_sql(ddl)
+
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+        _retire_log_tags(conn)
+
+
+def _slugify_title(title: str) -> str:
+    """Best-guess LeetCode slug for a title ("Pow(x, n)" -> "powx-n")."""
+    kept = "".join(char for char in title.lower() if char.isalnum() or char in " -")
+    return "-".join(kept.split())
+
+
+def _retire_log_tags(conn) -> None:
+    """
+    Move tags off the log table (databases from before the Tag table).
+
+    Logs now read their tags through the problem they reference, so every
+    log with tags is linked to a catalog problem first: by frontend ID when
+    the catalog knows it, otherwise to a stub problem built from the log's
+    own ID, title, and tags (stale, so it is refreshed on its next lookup;
+    a wrong guessed slug is retired once the real one is synced under the
+    same ID). Tag links are then built from the catalog, and log.tags is
+    dropped only if no tags would be lost. Needs SQLite 3.35+.
+    """
+    # Log no longer maps the column, so read the table as it is on disk
+    log_table = Table("log", MetaData(), autoload_with=conn)
+    if "tags" not in log_table.c:
+        return
+    problem_table = Problem.__table__
+    has_tags = func.coalesce(log_table.c.tags, "") != ""
+
+    # Logs saved before problem_slug existed: resolve the slug by frontend ID
+    conn.execute(
+        update(log_table)
+        .where(log_table.c.problem_slug == None, log_table.c.problem_id != "")
+        .values(problem_slug=(
+            select(problem_table.c.slug)
+            .where(problem_table.c.frontend_id == log_table.c.problem_id)
+            .scalar_subquery()
+        ))
+    )
+
+    known_slugs = set(conn.execute(select(problem_table.c.slug)).scalars())
+    known_ids = set(conn.execute(
+        select(problem_table.c.frontend_id).where(problem_table.c.frontend_id != None)
+    ).scalars())
+    rows = conn.execute(
+        select(
+            log_table.c.id,
+            log_table.c.problem_slug,
+            log_table.c.problem_id,
+            log_table.c.problem_title,
+            log_table.c.difficulty,
+            log_table.c.tags
+        )
+        .where(has_tags)
+        .order_by(log_table.c.id)
+    ).all()
+
+    stubs = {}
+    slug_by_id = {}
+    for log_id, slug, problem_id, title, difficulty, tags in rows:
+        if slug is None:
+            # Logs of one problem share a stub even if their titles differ
+            slug = slug_by_id.get(problem_id) or _slugify_title(title or "") or f"problem-{problem_id or log_id}"
+            conn.execute(update(log_table).where(log_table.c.id == log_id).values(problem_slug=slug))
+        if problem_id:
+            slug_by_id.setdefault(problem_id, slug)
+        if slug in known_slugs or slug in stubs:
+            continue
+
+        frontend_id = problem_id or None
+        if frontend_id in known_ids:
+            frontend_id = None  # Claimed by another catalog entry (frontend_id is unique)
+        elif frontend_id:
+            known_ids.add(frontend_id)
+        stubs[slug] = {
+            "slug": slug,
+            "frontend_id": frontend_id,
+            "title": title or "",
+            "difficulty": difficulty or "",
+            "tags": tags,
+            "paid_only": False,
+            "fetched_at": datetime(1970, 1, 1, tzinfo=timezone.utc)  # stale: refreshed on lookup
+        }
+    if stubs:
+        conn.execute(problem_table.insert(), list(stubs.values()))
+
+    with Session(bind=conn) as session:
+        set_problem_tags(session, dict(session.exec(select(Problem.slug, Problem.tags)).all()))
+        session.flush()
+
+    homeless = conn.execute(
+        select(func.count())
+        .select_from(log_table)
+        .where(
+            has_tags,
+            ~log_table.c.problem_slug.in_(select(problem_table.c.slug))
+            | (log_table.c.problem_slug == None)
+        )
+    ).scalar_one()
+    if homeless:
+        raise RuntimeError(f"{homeless} log(s) could not be linked to a problem; log.tags was not dropped")
+
+    conn.exec_driver_sql("ALTER TABLE log DROP COLUMN tags")
+    print(f"Moved log tags to the Tag table ({len(stubs)} problem(s) added from logs)")
+
+
+def split_tags(tags: str) -> List[str]:
+    """Split a comma-separated tag string into unique, stripped names."""
+    return list(dict.fromkeys(tag.strip() for tag in tags.split(",") if tag.strip()))
+
+
+def insert_for(session: Union[Session, AsyncSession]):
+    """
+    The dialect-specific insert() of a session's database.
+
+    Both supported backends (SQLite and PostgreSQL) provide
+    on_conflict_do_nothing/on_conflict_do_update on their insert constructs.
+
+    Args:
+        session: Sync or async database session
+
+    Returns:
+        The insert function of the session's dialect
+    """
+    return sqlite.insert if session.bind.dialect.name == "sqlite" else postgresql.insert
+
+
+def _tag_ids(session: Session, names: Iterable[str]) -> Dict[str, int]:
+    """Map tag names to IDs, creating missing tags (safe against concurrent inserts)."""
+    names = list(names)
+    if not names:
+        return {}
+
+    session.exec(
+        insert_for(session)(Tag)
+        .values([{"name": name} for name in names])
+        .on_conflict_do_nothing(index_elements=["name"])
+    )
+    return dict(session.exec(select(Tag.name, Tag.id).where(Tag.name.in_(names))).all())
+
+
+def set_problem_tags(session: Session, tags_by_slug: Dict[str, str]) -> List[str]:
+    """
+    Replace the tag links of catalog problems.
+
+    Args:
+        session: Database session (the links are written with it)
+        tags_by_slug: Comma-separated tag names per Problem.slug
+
+    Returns:
+        Slugs whose set of tags changed
+    """
+    if not tags_by_slug:
+        return []
+
+    names_by_slug = {slug: split_tags(tags) for slug, tags in tags_by_slug.items()}
+    tag_ids = _tag_ids(session, {name for names in names_by_slug.values() for name in names})
+
+    current: Dict[str, set] = {slug: set() for slug in names_by_slug}
+    links = select(ProblemTag.problem_slug, ProblemTag.tag_id).where(ProblemTag.problem_slug.in_(list(names_by_slug)))
+    for slug, tag_id in session.exec(links).all():
+        current[slug].add(tag_id)
+    changed = [
+        slug for slug, names in names_by_slug.items()
+        if current[slug] != {tag_ids[name] for name in names}
+    ]
+
+    session.exec(delete(ProblemTag).where(ProblemTag.problem_slug.in_(list(names_by_slug))))
+    session.add_all(
+        ProblemTag(problem_slug=slug, tag_id=tag_ids[name])
+        for slug, names in names_by_slug.items()
+        for name in names
+    )
+    return changed
+
+
+def _attempt_counter_upsert(insert, user_id: int, problem_id: str):
+    existing_logs = (
+        select(func.count())
+        .select_from(Log)
+        .where(
+            Log.user_id == user_id,
+            Log.problem_id == problem_id,
+            Log.enrichment_status != EnrichmentStatus.PENDING  # numbered once enriched
+        )
+        .scalar_subquery()
+    )
+    statement = (
+        insert(AttemptCounter)
+        .values(user_id=user_id, problem_id=problem_id, last_attempt=existing_logs + 1)
+    )
+    return statement.on_conflict_do_update(
+        index_elements=["user_id", "problem_id"],
+        set_={"last_attempt": AttemptCounter.last_attempt + 1}
+    ).returning(AttemptCounter.last_attempt)
+
+
+async def anext_attempt_number(session: AsyncSession, user_id: int, problem_id: str) -> int:
+    """
+    Atomically allocate the next attempt number for a user's problem.
+
+    A single upsert increments the per-(user, problem) counter, so concurrent
+    saves never get the same number. The first allocation for a pair seeds
+    the counter from the logs already stored for it.
+
+    Args:
+        session: Async database session (the increment commits with it)
+        user_id: User ID
+        problem_id: Frontend problem ID
+
+    Returns:
+        The attempt number for the new log
+    """
+    statement = _attempt_counter_upsert(insert_for(session), user_id, problem_id)
+    result = await session.exec(statement)
+    return result.scalar_one()
 
 
 def get_session():
     """Dependency for FastAPI to get database session"""
     with Session(engine) as session:
-        yield session
\ No newline at end of file
+        yield session
+
+
+async def get_async_session():
+    """Dependency for async FastAPI routes to get an async database session"""
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
@@ -0,0 +1,188 @@
+"""
+Background enrichment of practice logs.
+
+In deferred mode (LOG_ENRICHMENT_MODE=deferred) create_log stores a log
+immediately when its problem is not in the local catalog yet, marked as
+PENDING. A background worker then fills in the problem metadata from the
+catalog or scraper, retrying failed lookups on later passes.
+"""
+import asyncio
+from typing import Optional, Dict
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .database import async_engine, Log, EnrichmentStatus, PracticeStatus, anext_attempt_number
+from .config import ENRICHMENT_POLL_SECONDS, ENRICHMENT_MAX_ATTEMPTS, ENRICHMENT_BATCH_SIZE
+from . import catalog, scraper, stats
+
+
+_wakeup: Optional[asyncio.Event] = None
+_worker: Optional[asyncio.Task] = None
+
+
+def lookup_cached(problem_input: str) -> Optional[Dict[str, str]]:
+    """
+    Resolve a slug or numeric ID from the local catalog only.
+
+    Args:
+        problem_input: Problem slug or frontend ID
+
+    Returns:
+        Problem info (with slug) if the catalog has it, otherwise None
+    """
+    slug = catalog.get_slug_by_id(problem_input) if problem_input.isdigit() else problem_input
+    if not slug:
+        return None
+
+    problem = catalog.get_problem(slug)
+    if problem is None:
+        return None
+    return {"slug": slug, **catalog.to_problem_info(problem)}
+
+
+async def alookup_cached(problem_input: str) -> Optional[Dict[str, str]]:
+    """Async version of lookup_cached (runs the catalog reads in a thread)."""
+    return await asyncio.to_thread(lookup_cached, problem_input)
+
+
+async def create_pending_log(
+    session: AsyncSession,
+    user_id: int,
+    problem_input: str,
+    status: PracticeStatus,
+    note: Optional[str]
+) -> Log:
+    """
+    Store a log whose problem metadata will be filled in by the worker.
+
+    Args:
+        session: Database session
+        user_id: User ID
+        problem_input: Problem slug or frontend ID as entered
+        status: Practice status
+        note: Optional note
+
+    Returns:
+        The created PENDING log entry
+    """
+    is_id = problem_input.isdigit()
+    log = Log(
+        user_id=user_id,
+        problem_id=problem_input if is_id else "",
+        problem_slug=None if is_id else problem_input,
+        problem_title=f"Problem {problem_input}" if is_id else problem_input,
+        difficulty="",
+        status=status,
+        note=note,
+        enrichment_status=EnrichmentStatus.PENDING
+    )
+    session.add(log)
+    await session.commit()
+    await session.refresh(log)
+
+    notify()
+    return log
+
+
+async def _apply_problem_info(session: AsyncSession, log: Log, problem_info: Dict[str, str]) -> None:
+    log.attempt_count = await anext_attempt_number(session, log.user_id, problem_info["problem_id"])
+    log.problem_id = problem_info["problem_id"]
+    log.problem_title = problem_info["title"]
+    log.difficulty = problem_info["difficulty"]
+    log.enrichment_status = EnrichmentStatus.DONE
+    session.add(log)
+    if stats.is_counted(log):
+        await stats.add_log(session, log)
+
+
+def _record_failure(session: AsyncSession, log: Log) -> None:
+    log.enrichment_attempts += 1
+    if log.enrichment_attempts >= ENRICHMENT_MAX_ATTEMPTS:
+        log.enrichment_status = EnrichmentStatus.FAILED
+        print(f"Giving up enrichment for log {log.id} after {log.enrichment_attempts} attempts")
+    session.add(log)
+
+
+async def enrich_pending_logs() -> int:
+    """
+    Run one enrichment pass over up to ENRICHMENT_BATCH_SIZE pending logs.
+
+    Returns:
+        Number of logs enriched
+    """
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        statement = (
+            select(Log)
+            .where(Log.enrichment_status == EnrichmentStatus.PENDING)
+            .order_by(Log.id)
+            .limit(ENRICHMENT_BATCH_SIZE)
+        )
+        logs = (await session.exec(statement)).all()
+        if not logs:
+            return 0
+
+        try:
+            # Logs entered by numeric ID need their slug first
+            for log in logs:
+                if not log.problem_slug:
+                    log.problem_slug = await scraper.aget_slug_from_id(log.problem_id)
+
+            slugs = [log.problem_slug for log in logs if log.problem_slug]
+            problems_info = await scraper.aget_problems_info(slugs)
+        except scraper.LeetCodeUnavailableError as e:
+            # Not the logs' fault: keep them pending without using up attempts
+            print(f"Enrichment paused: {e}")
+            await session.commit()
+            return 0
+
+        enriched = 0
+        for log in logs:
+            problem_info = problems_info.get(log.problem_slug) if log.problem_slug else None
+            if problem_info:
+                await _apply_problem_info(session, log, problem_info)
+                enriched += 1
+            else:
+                _record_failure(session, log)
+
+        await session.commit()
+        return enriched
+
+
+async def _run() -> None:
+    while True:
+        try:
+            enriched = await enrich_pending_logs()
+            if enriched >= ENRICHMENT_BATCH_SIZE:
+                continue  # More may be waiting
+        except Exception as e:
+            print(f"Error enriching pending logs: {e}")
+
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=ENRICHMENT_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
+
+
+def notify() -> None:
+    """Wake the worker up so a newly created pending log is enriched right away."""
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+def start_worker() -> None:
+    """Start the enrichment worker on the running event loop."""
+    global _wakeup, _worker
+    _wakeup = asyncio.Event()
+    _worker = asyncio.create_task(_run())
+
+
+async def stop_worker() -> None:
+    """Cancel the enrichment worker."""
+    global _worker
+    if _worker is not None:
+        _worker.cancel()
+        try:
+            await _worker
+        except asyncio.CancelledError:
+            pass
+        _worker = None
@@ -0,0 +1,96 @@
+"""
+Persistent cache of AI-generated problem hints.
+
+Hints don't depend on the user, so they are stored once per problem and per
+prompt version and model: an in-memory TTL/LRU tier in front of the
+HintCacheEntry table. Bumping the prompt version or changing GEMINI_MODEL
+starts a fresh set of entries.
+"""
+import json
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Union
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .database import async_engine, insert_for, HintCacheEntry
+from .config import HINT_CACHE_MEMORY_TTL_SECONDS, HINT_CACHE_MEMORY_MAX_SIZE, HINT_CACHE_TTL_DAYS
+from .utils.cache import TTLCache
+from .utils.dates import as_utc
+
+
+_memory = TTLCache(HINT_CACHE_MEMORY_TTL_SECONDS, max_size=HINT_CACHE_MEMORY_MAX_SIZE)
+
+
+def problem_key(problem_title: str, problem_id: Optional[Union[int, str]] = None) -> str:
+    """
+    Canonical cache key for a problem.
+
+    Args:
+        problem_title: Problem title (used when no ID is known)
+        problem_id: Frontend problem ID, if known
+
+    Returns:
+        "id:<frontend id>" or "title:<normalized title>"
+    """
+    if problem_id:
+        return f"id:{problem_id}"
+    return "title:" + " ".join(problem_title.lower().split())
+
+
+async def get(problem_key: str, prompt_version: str, model: str) -> Optional[List[str]]:
+    """
+    Look up cached hints, memory first, then the database.
+
+    Args:
+        problem_key: Key from problem_key()
+        prompt_version: Version of the hint prompt
+        model: Model that generated the hints
+
+    Returns:
+        The hints, or None if not cached or older than HINT_CACHE_TTL_DAYS
+    """
+    key = (problem_key, prompt_version, model)
+    hints = _memory.get(key)
+    if hints is not None:
+        return hints
+
+    async with AsyncSession(async_engine) as session:
+        entry = await session.get(HintCacheEntry, key)
+    if entry is None:
+        return None
+
+    age = datetime.now(timezone.utc) - as_utc(entry.created_at)
+    if age > timedelta(days=HINT_CACHE_TTL_DAYS):
+        return None
+
+    hints = json.loads(entry.hints)
+    _memory.set(key, hints)
+    return hints
+
+
+async def put(problem_key: str, prompt_version: str, model: str, hints: List[str]) -> None:
+    """
+    Store hints in both tiers, replacing any previous entry.
+
+    Args:
+        problem_key: Key from problem_key()
+        prompt_version: Version of the hint prompt
+        model: Model that generated the hints
+        hints: Generated hints
+    """
+    values = {
+        "problem_key": problem_key,
+        "prompt_version": prompt_version,
+        "model": model,
+        "hints": json.dumps(hints),
+        "created_at": datetime.now(timezone.utc)
+    }
+
+    async with AsyncSession(async_engine) as session:
+        statement = insert_for(session)(HintCacheEntry).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=["problem_key", "prompt_version", "model"],
+            set_={"hints": values["hints"], "created_at": values["created_at"]}
+        )
+        await session.exec(statement)
+        await session.commit()
+
+    _memory.set((problem_key, prompt_version, model), hints)
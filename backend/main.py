@@ -1,7 +1,11 @@
+import threading
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from .database import create_db_and_tables
 from .routers import auth, logs, users, problems, ai
+from .utils.resilience import LimiterRejected
+from . import catalog, scraper, enrichment, stats
 
 
 @asynccontextmanager
@@ -12,13 +16,43 @@ async def lifespan(app: FastAPI):
     """
     # Startup logic
     create_db_and_tables()
+    stats.ensure_built()
+    # Warm the ID/slug index; (re)build it from the full problemset when the
+    # last sync is missing or stale (single lookups alone don't fill it)
+    catalog.load_index()
+    if catalog.needs_sync():
+        threading.Thread(target=scraper.build_problem_index, daemon=True).start()
+    enrichment.start_worker()
     yield
-    # Shutdown logic (pass for now)
+    # Shutdown logic
+    await enrichment.stop_worker()
+    await scraper.aclose()
 
 
 # Initialize FastAPI app
 app = FastAPI(title="SolveNext API", lifespan=lifespan)
 
+@app.exception_handler(scraper.LeetCodeUnavailableError)
+async def leetcode_unavailable_handler(request: Request, exc: scraper.LeetCodeUnavailableError):
+    """Fail fast with 503 while outbound LeetCode calls are being refused."""
+    retry_after = scraper.get_status()["circuit_breaker"]["retry_in_seconds"]
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"LeetCode is temporarily unavailable: {exc}"},
+        headers={"Retry-After": str(max(int(retry_after), 1))}
+    )
+
+
+@app.exception_handler(LimiterRejected)
+async def ai_overloaded_handler(request: Request, exc: LimiterRejected):
+    """Shed AI requests beyond the Gemini concurrency limit: 429 when the queue is full, 503 on queue timeout."""
+    return JSONResponse(
+        status_code=429 if exc.queue_full else 503,
+        content={"detail": f"The AI coach is busy, please try again shortly ({exc})"},
+        headers={"Retry-After": "5"}
+    )
+
+
 # Include routers
 app.include_router(auth.router, tags=["Auth"])
 app.include_router(logs.router, tags=["Logs"])
@@ -37,12 +71,21 @@ def read_root():
             "signup": "POST /auth/signup",
             "login": "POST /auth/login",
             "create_log": "POST /logs",
+            "preview_problem": "POST /problems/preview",
+            "preview_problems": "POST /problems/preview/batch",
+            "scraper_status": "GET /problems/scraper/status",
             "get_user_logs": "GET /users/{user_id}/logs",
+            "get_user_log_groups": "GET /users/{user_id}/logs/grouped",
+            "get_tag_stats": "GET /users/{user_id}/stats/tags",
             "update_log": "PATCH /logs/{log_id}",
             "delete_log": "DELETE /logs/{log_id}",
             "get_trash": "GET /users/{user_id}/logs/trash",
             "restore_log": "POST /logs/{log_id}/restore",
             "empty_trash": "DELETE /users/{user_id}/logs/trash/empty",
-            "get_recommendations": "POST /recommendations"
+            "get_recommendations": "POST /recommendations",
+            "stream_recommendations": "POST /recommendations/stream",
+            "get_hints": "POST /recommendations/hints",
+            "stream_hints": "POST /recommendations/hints/stream",
+            "ai_status": "GET /recommendations/status"
         }
     }
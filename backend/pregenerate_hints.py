@@ -0,0 +1,149 @@
+"""
+Offline hint pre-generation.
+
+Generates and caches 3-tier hints for the problems users log and get
+recommended most often, so their first "Ask AI for Hints" click is a cache
+read. Meant to run off-peak (e.g., from cron). Problems whose hints are
+already cached for the current prompt version and model are skipped, so an
+interrupted or partly failed run resumes where it stopped when run again.
+
+Usage:
+    python -m backend.pregenerate_hints [--top 200] [--concurrency 4] [--per-minute 30] [--dry-run]
+"""
+import argparse
+import asyncio
+from collections import Counter
+from typing import Dict, List, Tuple
+from sqlmodel import Session, select, func
+from .database import engine, async_engine, create_db_and_tables, Log, RecommendationCount, EnrichmentStatus
+from .config import HINT_PREGEN_TOP_N, HINT_PREGEN_CONCURRENCY, HINT_PREGEN_PER_MINUTE, GEMINI_MODEL, AI_MAX_CONCURRENCY
+from .utils.resilience import TokenBucket, LimiterRejected
+from . import ai_service, hint_cache
+
+
+def top_problems(limit: int) -> List[Tuple[str, str]]:
+    """
+    Rank problems by how often they are logged plus how often they are recommended.
+
+    Args:
+        limit: Number of problems to return
+
+    Returns:
+        (frontend ID, title) pairs, most popular first
+    """
+    demand: Counter = Counter()
+    titles: Dict[str, str] = {}
+
+    with Session(engine) as session:
+        logged = (
+            select(Log.problem_id, func.max(Log.problem_title), func.count(Log.id))
+            .where(Log.problem_id != "", Log.enrichment_status == EnrichmentStatus.DONE)
+            .group_by(Log.problem_id)
+        )
+        for problem_id, title, count in session.exec(logged).all():
+            demand[problem_id] += count
+            titles[problem_id] = title
+
+        recommended = select(RecommendationCount.problem_id, RecommendationCount.title, RecommendationCount.count)
+        for problem_id, title, count in session.exec(recommended).all():
+            demand[problem_id] += count
+            titles.setdefault(problem_id, title)
+
+    return [(problem_id, titles[problem_id]) for problem_id, _ in demand.most_common(limit)]
+
+
+async def pregenerate(
+    problems: List[Tuple[str, str]],
+    concurrency: int,
+    per_minute: float
+) -> Dict[str, int]:
+    """
+    Generate and cache hints for problems that don't have them yet.
+
+    Args:
+        problems: (frontend ID, title) pairs
+        concurrency: Maximum LLM calls in flight (capped at AI_MAX_CONCURRENCY)
+        per_minute: Maximum LLM calls started per minute
+
+    Returns:
+        Dictionary with generated, skipped, and failed counts
+    """
+    # More workers than AI call slots would only wait in the limiter's queue
+    concurrency = max(1, min(concurrency, AI_MAX_CONCURRENCY))
+    quota = TokenBucket(rate=per_minute / 60, capacity=concurrency)
+    queue: asyncio.Queue = asyncio.Queue()
+    for problem in problems:
+        queue.put_nowait(problem)
+    counts = {"generated": 0, "skipped": 0, "failed": 0}
+
+    async def worker() -> None:
+        while True:
+            try:
+                problem_id, title = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            key = hint_cache.problem_key(title, problem_id)
+            if await hint_cache.get(key, ai_service.HINT_PROMPT_VERSION, GEMINI_MODEL):
+                counts["skipped"] += 1
+                continue
+
+            await asyncio.sleep(quota.reserve(max_wait=float("inf")))
+            try:
+                hints = await ai_service.generate_problem_hints(title)
+            except LimiterRejected:
+                hints = None
+            if not hints:
+                counts["failed"] += 1
+                print(f"  failed: {problem_id}. {title}")
+                continue
+
+            await hint_cache.put(key, ai_service.HINT_PROMPT_VERSION, GEMINI_MODEL, hints)
+            counts["generated"] += 1
+            print(f"  cached: {problem_id}. {title}")
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        await async_engine.dispose()
+    return counts
+
+
+def _positive(cast):
+    """argparse type that rejects zero and negative values."""
+    def parse(value: str):
+        number = cast(value)
+        if number <= 0:
+            raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+        return number
+    return parse
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pre-generate AI hints for the most popular problems.")
+    parser.add_argument("--top", type=_positive(int), default=HINT_PREGEN_TOP_N, help="Number of problems to cover")
+    parser.add_argument("--concurrency", type=_positive(int), default=HINT_PREGEN_CONCURRENCY, help="LLM calls in flight")
+    parser.add_argument("--per-minute", type=_positive(float), default=HINT_PREGEN_PER_MINUTE, help="LLM calls per minute")
+    parser.add_argument("--dry-run", action="store_true", help="Only list the selected problems")
+    args = parser.parse_args()
+
+    create_db_and_tables()
+    problems = top_problems(args.top)
+    print(f"Selected {len(problems)} problem(s) by log and recommendation frequency")
+
+    if args.dry_run:
+        for problem_id, title in problems:
+            print(f"  {problem_id}. {title}")
+        return
+
+    counts = asyncio.run(pregenerate(problems, args.concurrency, args.per_minute))
+    print(
+        f"Hint pre-generation done: {counts['generated']} generated, "
+        f"{counts['skipped']} already cached, {counts['failed']} failed"
+    )
+    if counts["failed"]:
+        raise SystemExit("Some problems failed; run again to retry them")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,51 @@
 """
 AI router for recommendations and hints generation.
 """
+import json
+from typing import AsyncIterator, Tuple
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
-from ..database import get_session, User
-from ..schemas import RecommendationRequest, RecommendationResponse
+from fastapi.responses import StreamingResponse
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..database import get_async_session, User
+from ..schemas import RecommendationRequest, RecommendationResponse, HintRequest
 from .. import ai_service
 
 
 router = APIRouter()
 
 
+async def _sse(events: AsyncIterator[Tuple[str, dict]]) -> AsyncIterator[str]:
+    """Format (event, data) pairs as Server-Sent Events."""
+    async for event, data in events:
+        yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _event_stream(events: AsyncIterator[Tuple[str, dict]]) -> StreamingResponse:
+    return StreamingResponse(
+        _sse(events),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _get_user(session: AsyncSession, username: str) -> User:
+    statement = select(User).where(User.username == username)
+    user = (await session.exec(statement)).first()
+    
+    if not user:
+        raise HTTPException(
+            status_code=404,
+            detail=f"User '{username}' not found"
+        )
+    return user
+
+
 @router.post("/recommendations", response_model=RecommendationResponse)
-def get_recommendations(
+async def get_recommendations(
     request: RecommendationRequest,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Get AI-powered problem recommendations based on user history.
@@ -27,17 +58,10 @@ def get_recommendations(
         RecommendationResponse with advice and recommended problems
     """
     # Find user by username
-    statement = select(User).where(User.username == request.username)
-    user = session.exec(statement).first()
-    
-    if not user:
-        raise HTTPException(
-            status_code=404,
-            detail=f"User '{request.username}' not found"
-        )
+    user = await _get_user(session, request.username)
     
     # Generate recommendations using AI service
-    recommendations = ai_service.generate_recommendations(
+    recommendations = await ai_service.generate_recommendations(
         session=session,
         request=request,
         user_id=user.id
@@ -46,30 +70,101 @@ def get_recommendations(
     return recommendations
 
 
-@router.post("/recommendations/hints")
-def get_problem_hints(
-    request: dict,
-    session: Session = Depends(get_session)
+@router.post("/recommendations/stream")
+async def stream_recommendations(
+    request: RecommendationRequest,
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
-    Get AI-generated hints for a specific LeetCode problem.
+    Stream AI recommendations as Server-Sent Events.
+    
+    Events: "advice", one "recommendation" per problem as soon as it is
+    generated, then "done" (or "error").
     
     Args:
-        request: Dictionary with problem_title
+        request: RecommendationRequest with username, tags, difficulty, count
         session: Database session
     
     Returns:
-        Dictionary with list of 3 progressive hints
+        text/event-stream response
+    """
+    user = await _get_user(session, request.username)
+    events = await ai_service.stream_recommendations(
+        session=session,
+        request=request,
+        user_id=user.id
+    )
+    return _event_stream(events)
+
+
+@router.post("/recommendations/hints")
+async def get_problem_hints(request: HintRequest):
     """
-    problem_title = request.get("problem_title")
+    Get AI-generated hints for a specific LeetCode problem.
+    
+    Hints are served from the hint cache unless regenerate is set.
+    
+    Args:
+        request: HintRequest with problem_title, optional problem_id, and regenerate
     
-    if not problem_title:
+    Returns:
+        Dictionary with list of 3 progressive hints
+    
+    Raises:
+        HTTPException: 400 if problem_title is empty
+    """
+    if not request.problem_title.strip():
         raise HTTPException(
             status_code=400,
             detail="problem_title is required"
         )
     
-    # Generate hints using AI service
-    hints = ai_service.get_problem_hints(problem_title)
+    # Get hints from the cache or generate them using AI service
+    hints = await ai_service.get_problem_hints(
+        request.problem_title,
+        problem_id=request.problem_id,
+        regenerate=request.regenerate
+    )
     
     return hints
+
+
+@router.post("/recommendations/hints/stream")
+async def stream_problem_hints(request: HintRequest):
+    """
+    Stream AI hints as Server-Sent Events: one "hint" event per tier as soon
+    as it is generated, then "done" (or "error" if the AI coach is busy).
+    
+    Args:
+        request: HintRequest with problem_title, optional problem_id, and regenerate
+    
+    Returns:
+        text/event-stream response
+    
+    Raises:
+        HTTPException: 400 if problem_title is empty
+    """
+    if not request.problem_title.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="problem_title is required"
+        )
+    
+    events = await ai_service.stream_problem_hints(
+        request.problem_title,
+        problem_id=request.problem_id,
+        regenerate=request.regenerate
+    )
+    return _event_stream(events)
+
+
+@router.get("/recommendations/status")
+def get_ai_status():
+    """
+    Report the AI call limiter state (calls in flight and waiting) and how
+    model responses parsed (parsed / salvaged / failed per kind).
+    
+    Returns:
+        Dictionary with the limiter snapshot and structured output counts
+    """
+    return ai_service.get_status()
@@ -2,15 +2,16 @@
 Authentication router for user signup and login.
 """
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
-from ..database import get_session, User
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..database import get_async_session, User
 
 
 router = APIRouter()
 
 
 @router.post("/auth/signup")
-def signup(username: str, session: Session = Depends(get_session)):
+async def signup(username: str, session: AsyncSession = Depends(get_async_session)):
     """
     Create a new user account.
     
@@ -26,7 +27,7 @@ def signup(username: str, session: Session = Depends(get_session)):
     """
     # Check if user already exists
     statement = select(User).where(User.username == username)
-    existing_user = session.exec(statement).first()
+    existing_user = (await session.exec(statement)).first()
     
     if existing_user:
         raise HTTPException(
@@ -37,8 +38,8 @@ def signup(username: str, session: Session = Depends(get_session)):
     # Create new user
     user = User(username=username)
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
     
     return {
         "user_id": user.id,
@@ -47,7 +48,7 @@ def signup(username: str, session: Session = Depends(get_session)):
 
 
 @router.post("/auth/login")
-def login(username: str, session: Session = Depends(get_session)):
+async def login(username: str, session: AsyncSession = Depends(get_async_session)):
     """
     Login an existing user.
     
@@ -63,7 +64,7 @@ def login(username: str, session: Session = Depends(get_session)):
     """
     # Check if user exists
     statement = select(User).where(User.username == username)
-    user = session.exec(statement).first()
+    user = (await session.exec(statement)).first()
     
     if not user:
         raise HTTPException(
@@ -2,23 +2,29 @@
 Logs router for creating, updating, and managing practice logs.
 """
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
-from ..database import get_session, User, Log
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..database import get_async_session, User, Log, anext_attempt_number
 from ..schemas import CreateLogRequest, UpdateLogRequest, LogResponse
-from .. import scraper
+from ..config import LOG_ENRICHMENT_MODE
+from .. import scraper, enrichment, stats
 
 
 router = APIRouter()
 
 
 @router.post("/logs", response_model=LogResponse)
-def create_log(
+async def create_log(
     request: CreateLogRequest,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Create a new practice log entry.
     
+    In deferred enrichment mode, a problem missing from the local catalog
+    does not block the save: the log is stored as PENDING and its metadata
+    is filled in by the background enrichment worker.
+    
     Args:
         request: CreateLogRequest with username, problem_slug, status, note
         session: Database session
@@ -28,7 +34,7 @@ def create_log(
     """
     # Find user by username
     statement = select(User).where(User.username == request.username)
-    user = session.exec(statement).first()
+    user = (await session.exec(statement)).first()
     
     if not user:
         raise HTTPException(
@@ -36,10 +42,19 @@ def create_log(
             detail=f"User '{request.username}' not found"
         )
     
+    if LOG_ENRICHMENT_MODE == "deferred" and await enrichment.alookup_cached(request.problem_slug) is None:
+        return await enrichment.create_pending_log(
+            session,
+            user.id,
+            request.problem_slug,
+            request.status,
+            request.note
+        )
+    
     # Get problem info from LeetCode
     problem_slug = request.problem_slug
     if problem_slug.isdigit():
-        slug_from_id = scraper.get_slug_from_id(problem_slug)
+        slug_from_id = await scraper.aget_slug_from_id(problem_slug)
         if not slug_from_id:
             raise HTTPException(
                 status_code=404,
@@ -47,7 +62,7 @@ def create_log(
             )
         problem_slug = slug_from_id
 
-    problem_info = scraper.get_problem_info(problem_slug)
+    problem_info = await scraper.aget_problem_info(problem_slug)
     
     if not problem_info:
         raise HTTPException(
@@ -55,13 +70,8 @@ def create_log(
             detail=f"Problem '{problem_slug}' not found on LeetCode"
         )
     
-    # Calculate attempt_count: count existing logs for this user and problem
-    statement = select(Log).where(
-        Log.user_id == user.id,
-        Log.problem_id == problem_info["problem_id"]
-    )
-    existing_logs = session.exec(statement).all()
-    attempt_count = len(existing_logs) + 1
+    # Allocate attempt_count atomically for this user and problem
+    attempt_count = await anext_attempt_number(session, user.id, problem_info["problem_id"])
     
     # Create new log entry
     new_log = Log(
@@ -69,7 +79,7 @@ def create_log(
         problem_id=problem_info["problem_id"],
         problem_title=problem_info["title"],
         difficulty=problem_info["difficulty"],
-        tags=problem_info["tags"],
+        problem_slug=problem_slug,
         attempt_count=attempt_count,
         status=request.status,
         note=request.note
@@ -77,17 +87,18 @@ def create_log(
     
     # Save to database
     session.add(new_log)
-    session.commit()
-    session.refresh(new_log)
+    await stats.add_log(session, new_log)
+    await session.commit()
+    await session.refresh(new_log)
     
     return new_log
 
 
 @router.patch("/logs/{log_id}", response_model=LogResponse)
-def update_log(
+async def update_log(
     log_id: int,
     request: UpdateLogRequest,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Update a specific practice log entry (partial update).
@@ -104,7 +115,7 @@ def update_log(
         HTTPException: 404 if log not found
     """
     # Find the log by ID
-    log = session.get(Log, log_id)
+    log = await session.get(Log, log_id)
     
     if not log:
         raise HTTPException(
@@ -112,6 +123,9 @@ def update_log(
             detail=f"Log with ID {log_id} not found"
         )
     
+    counted = stats.is_counted(log)
+    previous_status, previous_date = log.status, log.practice_date
+    
     # Update only provided fields
     if request.status is not None:
         log.status = request.status
@@ -120,18 +134,23 @@ def update_log(
     if request.practice_date is not None:
         log.practice_date = request.practice_date
     
+    # Re-count the log if it moved to another status or date
+    if counted and (log.status != previous_status or log.practice_date != previous_date):
+        await stats.remove_log(session, log, previous_status, previous_date)
+        await stats.add_log(session, log)
+    
     # Save changes
     session.add(log)
-    session.commit()
-    session.refresh(log)
+    await session.commit()
+    await session.refresh(log)
     
     return log
 
 
 @router.delete("/logs/{log_id}")
-def delete_log(
+async def delete_log(
     log_id: int,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Soft delete a specific practice log entry.
@@ -147,7 +166,7 @@ def delete_log(
         HTTPException: 404 if log not found
     """
     # Find the log by ID
-    log = session.get(Log, log_id)
+    log = await session.get(Log, log_id)
     
     if not log:
         raise HTTPException(
@@ -156,17 +175,20 @@ def delete_log(
         )
     
     # Soft delete: set is_deleted flag to True
+    was_counted = stats.is_counted(log)
     log.is_deleted = True
     session.add(log)
-    session.commit()
+    if was_counted:
+        await stats.remove_log(session, log)
+    await session.commit()
     
     return {"ok": True, "message": "Log moved to trash"}
 
 
 @router.post("/logs/{log_id}/restore")
-def restore_log(
+async def restore_log(
     log_id: int,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Restore a soft-deleted log entry.
@@ -182,7 +204,7 @@ def restore_log(
         HTTPException: 404 if log not found
     """
     # Find the log by ID (including deleted ones)
-    log = session.get(Log, log_id)
+    log = await session.get(Log, log_id)
     
     if not log:
         raise HTTPException(
@@ -191,8 +213,11 @@ def restore_log(
         )
     
     # Restore: set is_deleted flag to False
+    was_counted = stats.is_counted(log)
     log.is_deleted = False
     session.add(log)
-    session.commit()
+    if not was_counted and stats.is_counted(log):
+        await stats.add_log(session, log)
+    await session.commit()
     
     return {"ok": True, "message": "Log restored successfully"}
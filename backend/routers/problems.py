@@ -1,6 +1,7 @@
 """
 Problems router for problem preview functionality.
 """
+from typing import List
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from ..utils.parser import parse_problem_input
@@ -14,8 +15,12 @@ class ProblemPreviewRequest(BaseModel):
     problem_input: str
 
 
+class BatchProblemPreviewRequest(BaseModel):
+    problem_inputs: List[str]
+
+
 @router.post("/problems/preview")
-def preview_problem(request: ProblemPreviewRequest):
+async def preview_problem(request: ProblemPreviewRequest):
     """
     Preview problem details (title, difficulty) for a slug or ID.
     Accepts raw input and parses it internally using parse_problem_input.
@@ -30,10 +35,10 @@ def preview_problem(request: ProblemPreviewRequest):
         HTTPException: 400 for invalid format, 404 if problem not found
     """
     # Parse input to extract slug (handles URLs and IDs)
-    slug = parse_problem_input(request.problem_input)
+    slug = await parse_problem_input(request.problem_input)
 
     # Fetch problem info from LeetCode
-    problem_info = scraper.get_problem_info(slug)
+    problem_info = await scraper.aget_problem_info(slug)
     if not problem_info:
         raise HTTPException(
             status_code=404, 
@@ -46,3 +51,64 @@ def preview_problem(request: ProblemPreviewRequest):
         "difficulty": problem_info.get("difficulty", ""),
         "problem_id": problem_info.get("problem_id", "")
     }
+
+
+@router.post("/problems/preview/batch")
+async def preview_problems(request: BatchProblemPreviewRequest):
+    """
+    Preview many problems at once.
+    Catalog misses are resolved with batched GraphQL requests instead of one
+    request per problem.
+    
+    Args:
+        request: BatchProblemPreviewRequest with raw problem_inputs
+    
+    Returns:
+        List with one entry per input: slug, title, difficulty, problem_id,
+        or an error message if the input could not be resolved
+    """
+    slugs = {}
+    errors = {}
+    for problem_input in request.problem_inputs:
+        try:
+            slugs[problem_input] = await parse_problem_input(problem_input)
+        except HTTPException as e:
+            errors[problem_input] = e.detail
+
+    problems_info = await scraper.aget_problems_info(list(slugs.values()))
+
+    results = []
+    for problem_input in request.problem_inputs:
+        if problem_input in errors:
+            results.append({"input": problem_input, "error": errors[problem_input]})
+            continue
+
+        slug = slugs[problem_input]
+        problem_info = problems_info.get(slug)
+        if not problem_info:
+            results.append({
+                "input": problem_input,
+                "error": f"Problem '{slug}' not found on LeetCode"
+            })
+            continue
+
+        results.append({
+            "input": problem_input,
+            "slug": slug,
+            "title": problem_info.get("title", ""),
+            "difficulty": problem_info.get("difficulty", ""),
+            "problem_id": problem_info.get("problem_id", "")
+        })
+
+    return results
+
+
+@router.get("/problems/scraper/status")
+def get_scraper_status():
+    """
+    Report the outbound LeetCode circuit breaker and rate limiter state.
+    
+    Returns:
+        Dictionary with circuit_breaker and rate_limiter snapshots
+    """
+    return scraper.get_status()
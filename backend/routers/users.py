@@ -1,76 +1,314 @@
 """
 Users router for fetching user-specific logs and trash management.
 """
-from typing import List
-from fastapi import APIRouter, Depends
-from sqlmodel import Session, select, delete
-from ..database import get_session, Log
-from ..schemas import LogResponse
+from typing import Dict, List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import select, delete, func, or_, and_, cast, literal, String
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..database import get_async_session, Log, PracticeStatus, ProblemTag, Tag
+from ..schemas import LogResponse, LogPage, ProblemLogGroup, ProblemLogGroupPage, TagStatResponse
+from ..config import TRASH_PURGE_CHUNK_SIZE, LOGS_PAGE_MAX_LIMIT
+from ..utils.pagination import encode_cursor, decode_cursor
+from .. import stats
 
 
 router = APIRouter()
 
 
-@router.get("/users/{user_id}/logs", response_model=List[LogResponse])
-def get_user_logs(
+async def _list_logs(
+    session: AsyncSession,
     user_id: int,
-    session: Session = Depends(get_session)
+    is_deleted: bool,
+    limit: Optional[int],
+    cursor: Optional[str],
+    filters: tuple = ()
+) -> Union[List[Log], LogPage]:
+    """
+    List a user's logs newest first, optionally one keyset page at a time.
+
+    Pages are ordered by (practice_date, id) descending; a page starts right
+    after the row encoded in the cursor, so the query uses the
+    (user_id, is_deleted, practice_date) index instead of an OFFSET scan.
+    Without a limit every matching log is returned as a plain list.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    statement = (
+        select(Log)
+        .where(Log.user_id == user_id, Log.is_deleted == is_deleted, *filters)
+        .order_by(Log.practice_date.desc(), Log.id.desc())
+    )
+    
+    if limit is None:
+        return (await session.exec(statement)).all()
+    
+    if cursor:
+        try:
+            last_date, last_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        statement = statement.where(
+            or_(
+                Log.practice_date < last_date,
+                and_(Log.practice_date == last_date, Log.id < last_id)
+            )
+        )
+    
+    # Fetch one extra row to know whether another page follows
+    logs = (await session.exec(statement.limit(limit + 1))).all()
+    items = logs[:limit]
+    next_cursor = None
+    if len(logs) > limit:
+        next_cursor = encode_cursor(items[-1].practice_date, items[-1].id)
+    
+    return LogPage(items=items, next_cursor=next_cursor)
+
+
+@router.get("/users/{user_id}/logs", response_model=Union[List[LogResponse], LogPage])
+async def get_user_logs(
+    user_id: int,
+    limit: Optional[int] = Query(None, ge=1, le=LOGS_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    status: Optional[PracticeStatus] = None,
+    tag: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
-    Get all active (non-deleted) logs for a specific user.
+    Get active (non-deleted) logs for a specific user.
     
     Args:
         user_id: User ID
+        limit: Page size; when omitted all logs are returned as a list
+        cursor: next_cursor from the previous page
+        status: Only logs with this practice status
+        tag: Only logs of problems with this topic tag (e.g., "Graph")
         session: Database session
     
     Returns:
-        List of active log entries ordered by practice_date descending
+        Active log entries ordered by practice_date descending, as a list
+        or, when limit is given, as a page with next_cursor
     """
-    # Query all active logs for the user (is_deleted == False)
-    statement = (
-        select(Log)
-        .where(Log.user_id == user_id, Log.is_deleted == False)
-        .order_by(Log.practice_date.desc())
-    )
-    logs = session.exec(statement).all()
+    filters = []
+    if status is not None:
+        filters.append(Log.status == status)
+    if tag:
+        tagged_problems = (
+            select(ProblemTag.problem_slug)
+            .join(Tag, Tag.id == ProblemTag.tag_id)
+            .where(Tag.name == tag)
+        )
+        filters.append(Log.problem_slug.in_(tagged_problems))
     
-    return logs
+    return await _list_logs(session, user_id, False, limit, cursor, tuple(filters))
 
 
-@router.get("/users/{user_id}/logs/trash", response_model=List[LogResponse])
-def get_trash_logs(
+@router.get("/users/{user_id}/logs/trash", response_model=Union[List[LogResponse], LogPage])
+async def get_trash_logs(
     user_id: int,
-    session: Session = Depends(get_session)
+    limit: Optional[int] = Query(None, ge=1, le=LOGS_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
-    Get all soft-deleted (trashed) logs for a specific user.
+    Get soft-deleted (trashed) logs for a specific user.
     
     Args:
         user_id: User ID
+        limit: Page size; when omitted all logs are returned as a list
+        cursor: next_cursor from the previous page
         session: Database session
     
     Returns:
-        List of deleted log entries ordered by practice_date descending
+        Deleted log entries ordered by practice_date descending, as a list
+        or, when limit is given, as a page with next_cursor
     """
-    # Query all deleted logs for the user (is_deleted == True)
-    statement = (
-        select(Log)
-        .where(Log.user_id == user_id, Log.is_deleted == True)
-        .order_by(Log.practice_date.desc())
+    return await _list_logs(session, user_id, True, limit, cursor)
+
+
+async def _list_log_groups(
+    session: AsyncSession,
+    user_id: int,
+    is_deleted: bool,
+    limit: int,
+    cursor: Optional[str]
+) -> ProblemLogGroupPage:
+    """
+    List a user's logs grouped per problem, one keyset page of groups at a time.
+
+    Grouping and the per-problem aggregates run in SQL; groups are ordered by
+    their latest practice_date (then group key) descending, and only the
+    logs of the groups on the page are loaded. Logs are grouped by problem
+    ID, or, for logs not enriched yet (no ID), by the slug as entered.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    in_view = (Log.user_id == user_id, Log.is_deleted == is_deleted)
+    last_practiced = func.max(Log.practice_date)
+    # Pending/failed logs have no problem ID yet; a log with neither is its own group
+    group_key = func.coalesce(
+        func.nullif(Log.problem_id, ""),
+        Log.problem_slug,
+        literal("log:") + cast(Log.id, String)
+    )
+    
+    totals_statement = select(func.count(Log.id), func.count(func.distinct(group_key))).where(*in_view)
+    total_logs, total_problems = (await session.exec(totals_statement)).one()
+    
+    groups_statement = (
+        select(
+            group_key,
+            func.count(Log.id),
+            func.min(Log.practice_date),
+            last_practiced
+        )
+        .where(*in_view)
+        .group_by(group_key)
+        .order_by(last_practiced.desc(), group_key.desc())
     )
-    logs = session.exec(statement).all()
+    if cursor:
+        try:
+            last_date, last_key = decode_cursor(cursor, str)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        groups_statement = groups_statement.having(
+            or_(
+                last_practiced < last_date,
+                and_(last_practiced == last_date, group_key < last_key)
+            )
+        )
+    
+    # Fetch one extra group to know whether another page follows
+    rows = (await session.exec(groups_statement.limit(limit + 1))).all()
+    page_rows = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(page_rows[-1][3], page_rows[-1][0])
+    
+    logs_by_key: Dict[str, List[Log]] = {row[0]: [] for row in page_rows}
+    if logs_by_key:
+        logs_statement = (
+            select(group_key, Log)
+            .where(*in_view, group_key.in_(list(logs_by_key)))
+            .order_by(Log.practice_date.desc(), Log.id.desc())
+        )
+        for key, log in (await session.exec(logs_statement)).all():
+            logs_by_key[key].append(log)
+    
+    groups = []
+    for key, attempt_count, first_practiced, last_practiced_at in page_rows:
+        logs = logs_by_key[key]
+        latest = logs[0]
+        groups.append(ProblemLogGroup(
+            problem_id=latest.problem_id,
+            problem_title=latest.problem_title,
+            problem_slug=latest.problem_slug,
+            difficulty=latest.difficulty,
+            tags=latest.tags,
+            attempt_count=attempt_count,
+            latest_status=latest.status,
+            first_practiced=first_practiced,
+            last_practiced=last_practiced_at,
+            logs=logs
+        ))
     
-    return logs
+    return ProblemLogGroupPage(
+        groups=groups,
+        total_logs=total_logs,
+        total_problems=total_problems,
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/users/{user_id}/logs/grouped", response_model=ProblemLogGroupPage)
+async def get_user_log_groups(
+    user_id: int,
+    limit: int = Query(50, ge=1, le=LOGS_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Get active (non-deleted) logs for a specific user, grouped per problem.
+    
+    Args:
+        user_id: User ID
+        limit: Number of problem groups per page
+        cursor: next_cursor from the previous page
+        session: Database session
+    
+    Returns:
+        A page of problem groups, most recently practiced first, each with
+        its aggregates and logs, plus totals over all active logs
+    """
+    return await _list_log_groups(session, user_id, False, limit, cursor)
+
+
+@router.get("/users/{user_id}/logs/trash/grouped", response_model=ProblemLogGroupPage)
+async def get_trash_log_groups(
+    user_id: int,
+    limit: int = Query(50, ge=1, le=LOGS_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Get soft-deleted (trashed) logs for a specific user, grouped per problem.
+    
+    Args:
+        user_id: User ID
+        limit: Number of problem groups per page
+        cursor: next_cursor from the previous page
+        session: Database session
+    
+    Returns:
+        A page of problem groups, most recently practiced first, each with
+        its aggregates and logs, plus totals over all trashed logs
+    """
+    return await _list_log_groups(session, user_id, True, limit, cursor)
+
+
+@router.get("/users/{user_id}/stats/tags", response_model=List[TagStatResponse])
+async def get_tag_stats(
+    user_id: int,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Get a user's per-tag proficiency statistics.
+    
+    Args:
+        user_id: User ID
+        session: Database session
+    
+    Returns:
+        One entry per practiced tag, weakest (lowest score) first
+    """
+    tag_stats = [
+        TagStatResponse(
+            tag=name,
+            attempts=stat.attempts,
+            independent_count=stat.independent_count,
+            with_hint_count=stat.with_hint_count,
+            stuck_count=stat.stuck_count,
+            last_practiced=stat.last_practiced,
+            score=round(stats.current_score(stat), 3)
+        )
+        for name, stat in await stats.get_tag_stats(session, user_id)
+    ]
+    return sorted(tag_stats, key=lambda tag_stat: tag_stat.score)
 
 
 @router.delete("/users/{user_id}/logs/trash/empty")
-def empty_trash(
+async def empty_trash(
     user_id: int,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Permanently delete all soft-deleted logs for a specific user.
     
+    Rows are deleted in chunks of TRASH_PURGE_CHUNK_SIZE, each a single
+    DELETE committed on its own, so a large purge never holds the write lock
+    for long. The count comes from the statements' rowcounts.
+    
     Args:
         user_id: User ID
         session: Database session
@@ -78,14 +316,19 @@ def empty_trash(
     Returns:
         Success confirmation with count of deleted logs
     """
-    # Count how many logs will be deleted
-    count_statement = select(Log).where(Log.user_id == user_id, Log.is_deleted == True)
-    logs_to_delete = session.exec(count_statement).all()
-    count = len(logs_to_delete)
-    
-    # Permanently delete all soft-deleted logs for this user
-    delete_statement = delete(Log).where(Log.user_id == user_id, Log.is_deleted == True)
-    session.exec(delete_statement)
-    session.commit()
+    count = 0
+    while True:
+        chunk = (
+            select(Log.id)
+            .where(Log.user_id == user_id, Log.is_deleted == True)
+            .limit(TRASH_PURGE_CHUNK_SIZE)
+        )
+        delete_statement = delete(Log).where(Log.id.in_(chunk))
+        result = await session.exec(delete_statement)
+        await session.commit()
+        
+        count += result.rowcount
+        if result.rowcount < TRASH_PURGE_CHUNK_SIZE:
+            break
     
     return {"ok": True, "message": f"Trash emptied: {count} log(s) permanently deleted"}
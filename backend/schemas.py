@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import Enum
 from typing import List, Optional
 from pydantic import BaseModel, ConfigDict
-from .database import PracticeStatus
+from .database import PracticeStatus, EnrichmentStatus
 
 
 class Difficulty(str, Enum):
@@ -60,6 +60,12 @@ class RecommendationRequest(BaseModel):
     exclude_problems: List[str] = []
 
 
+class HintRequest(BaseModel):
+    problem_title: str
+    problem_id: Optional[int] = None
+    regenerate: bool = False  # "Ask AI Again": bypass and replace the cached hints
+
+
 # Response Models
 class LogResponse(BaseModel):
     id: int
@@ -74,10 +80,47 @@ class LogResponse(BaseModel):
     note: Optional[str] = None
     time_spent: Optional[int] = None
     is_deleted: bool = False
+    problem_slug: Optional[str] = None
+    enrichment_status: EnrichmentStatus = EnrichmentStatus.DONE
     
     model_config = ConfigDict(from_attributes=True)
 
 
+class LogPage(BaseModel):
+    items: List[LogResponse]
+    next_cursor: Optional[str] = None  # None on the last page
+
+
+class ProblemLogGroup(BaseModel):
+    problem_id: str
+    problem_title: str
+    problem_slug: Optional[str] = None
+    difficulty: str
+    tags: str
+    attempt_count: int  # Logs in this group
+    latest_status: PracticeStatus
+    first_practiced: datetime
+    last_practiced: datetime
+    logs: List[LogResponse]  # Newest first
+
+
+class ProblemLogGroupPage(BaseModel):
+    groups: List[ProblemLogGroup]
+    total_logs: int
+    total_problems: int
+    next_cursor: Optional[str] = None  # None on the last page
+
+
+class TagStatResponse(BaseModel):
+    tag: str
+    attempts: int
+    independent_count: int
+    with_hint_count: int
+    stuck_count: int
+    last_practiced: Optional[datetime] = None
+    score: float  # Decayed to now; negative means mostly hints/stuck lately
+
+
 class RecommendedProblem(BaseModel):
     problem_id: int
     title: str
@@ -88,4 +131,8 @@ class RecommendedProblem(BaseModel):
 
 class RecommendationResponse(BaseModel):
     advice: Optional[str] = None
-    recommendations: List[RecommendedProblem]
\ No newline at end of file
+    recommendations: List[RecommendedProblem]
+
+
+class ProblemHints(BaseModel):  # Model output schema for hint generation
+    hints: List[str]
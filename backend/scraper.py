@@ -1,144 +1,907 @@
+import asyncio
+import threading
+import time
+import httpx
 import requests
-from typing import Optional, Dict
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, List, Any, Tuple
+from . import catalog
+from .utils.singleflight import SingleFlight, AsyncSingleFlight
+from .utils.cache import TTLCache
+from .utils.resilience import TokenBucket, CircuitBreaker
+from .config import (
+    LEETCODE_GRAPHQL_URL,
+    LEETCODE_TIMEOUT_SECONDS,
+    LEETCODE_MAX_CONCURRENCY,
+    LEETCODE_MAX_KEEPALIVE,
+    LEETCODE_BATCH_SIZE,
+    LEETCODE_BATCH_WINDOW_MS,
+    NEGATIVE_CACHE_TTL_SECONDS,
+    LEETCODE_RATE_LIMIT_PER_SECOND,
+    LEETCODE_RATE_LIMIT_BURST,
+    LEETCODE_RATE_LIMIT_MAX_WAIT_SECONDS,
+    LEETCODE_BREAKER_FAILURE_THRESHOLD,
+    LEETCODE_BREAKER_RESET_SECONDS,
+)
+
+
+GRAPHQL_URL = LEETCODE_GRAPHQL_URL
+
+# Headers to mimic a browser request
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Content-Type": "application/json",
+    "Referer": "https://leetcode.com/"
+}
+
+# GraphQL query to fetch problem details
+PROBLEM_INFO_QUERY = """
+query getProblemInfo($titleSlug: String!) {
+    question(titleSlug: $titleSlug) {
+        questionFrontendId
+        title
+        difficulty
+        topicTags {
+            name
+        }
+    }
+}
+"""
+
+# Fields selected for each aliased question in a batched lookup
+QUESTION_FIELDS = """
+        questionFrontendId
+        title
+        difficulty
+        topicTags {
+            name
+        }
+"""
+
+# GraphQL query to search the problemset by frontend ID
+SLUG_FROM_ID_QUERY = """
+query problemsetQuestionList($categorySlug: String, $limit: Int, $skip: Int, $filters: QuestionListFilterInput) {
+  problemsetQuestionList: questionList(
+    categorySlug: $categorySlug
+    limit: $limit
+    skip: $skip
+    filters: $filters
+  ) {
+    data {
+      titleSlug
+      questionFrontendId
+    }
+  }
+}
+"""
+
+# GraphQL query to page through the whole problemset
+PROBLEMSET_QUERY = """
+query problemsetQuestionList($categorySlug: String, $limit: Int, $skip: Int, $filters: QuestionListFilterInput) {
+  problemsetQuestionList: questionList(
+    categorySlug: $categorySlug
+    limit: $limit
+    skip: $skip
+    filters: $filters
+  ) {
+    total: totalNum
+    data {
+      titleSlug
+      questionFrontendId
+      title
+      difficulty
+      paidOnly: isPaidOnly
+      topicTags {
+        name
+      }
+    }
+  }
+}
+"""
+
+
+class ScraperError(Exception):
+    """Raised when LeetCode could not be reached or returned an unusable response."""
+
+
+class LeetCodeUnavailableError(ScraperError):
+    """Raised without calling LeetCode while the circuit breaker is open or the rate limit is exhausted."""
+
+
+# Shared sync HTTP session: keeps TLS connections to leetcode.com alive
+_session = requests.Session()
+_session.headers.update(HEADERS)
+_session.mount(GRAPHQL_URL.split("://")[0] + "://", HTTPAdapter(pool_connections=1, pool_maxsize=LEETCODE_MAX_KEEPALIVE))
+_sync_slots = threading.BoundedSemaphore(LEETCODE_MAX_CONCURRENCY)
+
+# Shared async HTTP/2 client and per-host concurrency limit, created lazily
+# inside the running event loop
+_async_client: Optional[httpx.AsyncClient] = None
+_async_slots: Optional[asyncio.Semaphore] = None
+
+# Shared outbound rate limit and circuit breaker for all LeetCode calls
+_rate_limiter = TokenBucket(LEETCODE_RATE_LIMIT_PER_SECOND, LEETCODE_RATE_LIMIT_BURST)
+_breaker = CircuitBreaker(LEETCODE_BREAKER_FAILURE_THRESHOLD, LEETCODE_BREAKER_RESET_SECONDS)
+
+# Concurrent lookups for the same slug or ID share one in-flight fetch
+_flights = SingleFlight()
+_async_flights = AsyncSingleFlight()
+
+# Slugs and IDs LeetCode reported as not found. Network errors are never
+# recorded here, so transient failures are retried on the next lookup.
+_missing_slugs = TTLCache(NEGATIVE_CACHE_TTL_SECONDS)
+_missing_ids = TTLCache(NEGATIVE_CACHE_TTL_SECONDS)
+
+# Slugs with a background catalog refresh currently in progress
+_refreshing: set[str] = set()
+_refreshing_lock = threading.Lock()
+
+
+def _graphql_data(payload: Any) -> Dict:
+    """
+    Extract "data" from a GraphQL response body.
+
+    Fields named in the "errors" array are dropped, so a field that failed
+    reads as absent (retry later) rather than as an explicit null (not found).
+
+    Raises:
+        ScraperError: If the response reports errors and carries no data
+    """
+    if not isinstance(payload, dict):
+        raise ScraperError("Invalid GraphQL response")
+
+    data = payload.get("data")
+    errors = payload.get("errors") or []
+    if errors and not data:
+        messages = "; ".join(str(error.get("message", error)) if isinstance(error, dict) else str(error) for error in errors)
+        raise ScraperError(f"GraphQL errors: {messages}")
+
+    data = dict(data or {})
+    for error in errors:
+        path = error.get("path") if isinstance(error, dict) else None
+        if path:
+            data.pop(path[0], None)
+    return data
+
+
+def _admit() -> float:
+    """
+    Check the circuit breaker and rate limiter before an outbound call.
+
+    Returns:
+        Seconds to wait for the rate limiter before sending the request
+
+    Raises:
+        LeetCodeUnavailableError: If the breaker is open or no token frees up in time
+    """
+    if not _breaker.allow():
+        raise LeetCodeUnavailableError("LeetCode circuit breaker is open")
+
+    # Only admitted calls take a rate token; a refused one must not hold the half-open trial
+    delay = _rate_limiter.reserve(LEETCODE_RATE_LIMIT_MAX_WAIT_SECONDS)
+    if delay is None:
+        _breaker.abandon_trial()
+        raise LeetCodeUnavailableError("Outbound LeetCode rate limit exceeded")
+    return delay
+
+
+def _record_status(status_code: int, retry_after: Optional[str]) -> None:
+    """Feed an HTTP status into the circuit breaker."""
+    if status_code == 429:
+        try:
+            open_for = float(retry_after) if retry_after else None
+        except ValueError:
+            open_for = None
+        _breaker.trip(open_for)
+        raise LeetCodeUnavailableError("Rate limited by LeetCode (HTTP 429)")
+    if status_code >= 500:
+        _breaker.record_failure()
+    else:
+        _breaker.record_success()
+
+
+def _post(query: str, variables: Dict[str, Any], timeout: float = LEETCODE_TIMEOUT_SECONDS) -> Dict:
+    """
+    Send a GraphQL request over the shared keep-alive session.
+
+    Returns:
+        The "data" object of the GraphQL response
+
+    Raises:
+        LeetCodeUnavailableError: If the call was refused by the breaker or rate limiter
+        ScraperError: On network errors, HTTP errors, or malformed responses
+    """
+    delay = _admit()
+    try:
+        if delay:
+            time.sleep(delay)
+        with _sync_slots:
+            response = _session.post(
+                GRAPHQL_URL,
+                json={"query": query, "variables": variables},
+                timeout=timeout
+            )
+    except requests.exceptions.RequestException as e:
+        _breaker.record_failure()
+        raise ScraperError(str(e)) from e
+    except BaseException:
+        # No outcome to record; don't leave a half-open trial pending forever
+        _breaker.abandon_trial()
+        raise
+
+    _record_status(response.status_code, response.headers.get("Retry-After"))
+    try:
+        response.raise_for_status()
+        return _graphql_data(response.json())
+    except requests.exceptions.RequestException as e:
+        raise ScraperError(str(e)) from e
+    except ValueError as e:
+        raise ScraperError(f"Invalid JSON response: {e}") from e
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    global _async_client, _async_slots
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            http2=True,
+            headers=HEADERS,
+            timeout=LEETCODE_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=LEETCODE_MAX_CONCURRENCY,
+                max_keepalive_connections=LEETCODE_MAX_KEEPALIVE
+            )
+        )
+        _async_slots = asyncio.Semaphore(LEETCODE_MAX_CONCURRENCY)
+    return _async_client
+
+
+async def _apost(query: str, variables: Dict[str, Any], timeout: float = LEETCODE_TIMEOUT_SECONDS) -> Dict:
+    """
+    Async counterpart of _post using the shared HTTP/2 client.
+
+    Raises:
+        LeetCodeUnavailableError: If the call was refused by the breaker or rate limiter
+        ScraperError: On network errors, HTTP errors, or malformed responses
+    """
+    client = _get_async_client()
+    delay = _admit()
+    try:
+        if delay:
+            await asyncio.sleep(delay)
+        async with _async_slots:
+            response = await client.post(
+                GRAPHQL_URL,
+                json={"query": query, "variables": variables},
+                timeout=timeout
+            )
+    except httpx.HTTPError as e:
+        _breaker.record_failure()
+        raise ScraperError(str(e)) from e
+    except BaseException:
+        # Cancelled: no outcome to record; don't leave a half-open trial pending forever
+        _breaker.abandon_trial()
+        raise
+
+    _record_status(response.status_code, response.headers.get("Retry-After"))
+    try:
+        response.raise_for_status()
+        return _graphql_data(response.json())
+    except httpx.HTTPError as e:
+        raise ScraperError(str(e)) from e
+    except ValueError as e:
+        raise ScraperError(f"Invalid JSON response: {e}") from e
+
+
+def get_status() -> Dict[str, Any]:
+    """
+    Report the state of the outbound LeetCode protections.
+
+    Returns:
+        Dictionary with circuit breaker and rate limiter snapshots
+    """
+    return {
+        "circuit_breaker": _breaker.snapshot(),
+        "rate_limiter": _rate_limiter.snapshot()
+    }
+
+
+async def aclose() -> None:
+    """Close the shared async client (called on application shutdown)."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+def _parse_problem_info(question: Dict) -> Dict[str, str]:
+    # Extract tags and join them as comma-separated string
+    topic_tags = question.get("topicTags") or []
+    tags_str = ", ".join([tag["name"] for tag in topic_tags])
+
+    return {
+        "problem_id": question.get("questionFrontendId", ""),
+        "title": question.get("title", ""),
+        "difficulty": question.get("difficulty", ""),
+        "tags": tags_str
+    }
+
+
+def _slug_search_variables(problem_id: str) -> Dict[str, Any]:
+    return {
+        "categorySlug": "",
+        "limit": 1,
+        "skip": 0,
+        "filters": {
+            "searchKeywords": str(problem_id)
+        }
+    }
+
+
+def _find_slug(data: Dict, problem_id: str) -> Optional[str]:
+    items = (data.get("problemsetQuestionList") or {}).get("data") or []
+    for item in items:
+        if item.get("questionFrontendId") == str(problem_id):
+            return item.get("titleSlug")
+    return None
+
+
+def _batch_problem_query(count: int) -> str:
+    """Build a query fetching `count` questions at once via field aliases q0..qN."""
+    params = ", ".join(f"$s{i}: String!" for i in range(count))
+    fields = "".join(
+        f"    q{i}: question(titleSlug: $s{i}) {{{QUESTION_FIELDS}    }}\n"
+        for i in range(count)
+    )
+    return f"query getProblemsInfo({params}) {{\n{fields}}}\n"
+
+
+def _chunks(items: List[str], size: int) -> List[List[str]]:
+    return [items[i:i + size] for i in range(0, len(items), max(size, 1))]
+
+
+def _log_fetch_error(e: ScraperError, what: str) -> None:
+    """Re-raise refusals by the breaker or rate limiter; log any other failed request."""
+    if isinstance(e, LeetCodeUnavailableError):
+        raise e
+    print(f"Error fetching {what}: {e}")
+
+
+def _parse_question(title_slug: str, data: Dict) -> Optional[Dict[str, str]]:
+    """Problem info from a single-question response; caches explicit misses."""
+    if "question" not in data:
+        print(f"Error fetching problem info for '{title_slug}': no question in response")
+        return None
+    question = data["question"]
+    if not question:
+        print(f"Problem not found: {title_slug}")
+        _missing_slugs.set(title_slug)
+        return None
+    return _parse_problem_info(question)
+
+
+def _parse_slug_search(problem_id: str, data: Dict) -> Optional[str]:
+    """Slug from an ID search response; caches explicit misses."""
+    if "problemsetQuestionList" not in data:
+        print(f"Error fetching slug for problem ID '{problem_id}': no search results in response")
+        return None
+    slug = _find_slug(data, problem_id)
+    if not slug:
+        print(f"Problem ID not found: {problem_id}")
+        _missing_ids.set(str(problem_id))
+    return slug
+
+
+def _parse_batch(chunk: List[str], data: Dict) -> Dict[str, Optional[Dict[str, str]]]:
+    results: Dict[str, Optional[Dict[str, str]]] = {}
+    for i, slug in enumerate(chunk):
+        alias = f"q{i}"
+        if alias not in data:
+            continue  # Field failed: leave the slug out so it is retried
+        question = data[alias]
+        if question:
+            results[slug] = _parse_problem_info(question)
+        else:
+            _missing_slugs.set(slug)
+            results[slug] = None
+    return results
+
+
+class _ProblemBatcher:
+    """
+    Folds concurrent single-problem lookups into batched GraphQL requests.
+
+    Slugs requested within LEETCODE_BATCH_WINDOW_MS of each other (up to
+    LEETCODE_BATCH_SIZE) are fetched together with one aliased query.
+    """
+
+    def __init__(self, window_seconds: float, max_batch: int):
+        self._window = window_seconds
+        self._max_batch = max_batch
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def load(self, title_slug: str) -> Optional[Dict[str, str]]:
+        loop = asyncio.get_running_loop()
+        future = self._pending.get(title_slug)
+        if future is None:
+            future = loop.create_future()
+            self._pending[title_slug] = future
+            if len(self._pending) >= self._max_batch:
+                self._flush_now()
+            elif self._timer is None:
+                self._timer = loop.call_later(self._window, self._flush_now)
+        return await future
+
+    def _flush_now(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+        if pending:
+            asyncio.ensure_future(self._resolve(pending))
+
+    async def _resolve(self, pending: Dict[str, asyncio.Future]) -> None:
+        try:
+            results = await afetch_problems_info(list(pending))
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for slug, future in pending.items():
+            if not future.done():
+                future.set_result(results.get(slug))
+
+
+_batcher = _ProblemBatcher(LEETCODE_BATCH_WINDOW_MS / 1000, LEETCODE_BATCH_SIZE)
+
+
+def _from_catalog(title_slug: str, cached: Optional[catalog.Problem]) -> Optional[Dict[str, str]]:
+    """Problem info from a catalog entry (None if absent); stale entries are refreshed in the background."""
+    if cached is None:
+        return None
+    if not catalog.is_fresh(cached):
+        _schedule_refresh(title_slug)
+    return catalog.to_problem_info(cached)
+
+
+def _not_known_missing(title_slugs: List[str]) -> Tuple[Dict[str, Optional[Dict[str, str]]], List[str]]:
+    """Split slugs into known misses (as None results) and slugs still to look up."""
+    results: Dict[str, Optional[Dict[str, str]]] = {}
+    lookup: List[str] = []
+    for slug in dict.fromkeys(title_slugs):
+        if slug in _missing_slugs:
+            results[slug] = None
+        else:
+            lookup.append(slug)
+    return results, lookup
+
+
+def _merge_fetched(
+    results: Dict[str, Optional[Dict[str, str]]],
+    missing: List[str],
+    fetched: Dict[str, Optional[Dict[str, str]]]
+) -> Dict[str, Dict[str, str]]:
+    """Add fetched problems to results; returns the ones found (to be saved)."""
+    for slug in missing:
+        results[slug] = fetched.get(slug)
+    return {slug: fetched[slug] for slug in missing if fetched.get(slug)}
 
 
 def get_problem_info(title_slug: str) -> Optional[Dict[str, str]]:
+    """
+    Get problem information, consulting the local catalog first.
+
+    Fresh catalog entries are returned directly. Stale entries are returned
+    as well, while a background refresh re-fetches them from LeetCode.
+    Problems not yet in the catalog are fetched and stored.
+
+    Args:
+        title_slug: The URL slug of the LeetCode problem (e.g., "two-sum")
+
+    Returns:
+        Dictionary with problem_id, title, difficulty, and tags (comma-separated)
+        Returns None if the problem is unknown and the request fails
+
+    Raises:
+        LeetCodeUnavailableError: If a fetch is needed while LeetCode calls are
+            being refused by the circuit breaker or rate limiter
+    """
+    # Known misses are rejected in memory, before touching the catalog
+    if title_slug in _missing_slugs:
+        return None
+
+    problem_info = _from_catalog(title_slug, catalog.get_problem(title_slug))
+    if problem_info is not None:
+        return problem_info
+
+    return _flights.do(("problem", title_slug), lambda: _fetch_and_store(title_slug))
+
+
+def _fetch_and_store(title_slug: str) -> Optional[Dict[str, str]]:
+    problem_info = fetch_problem_info(title_slug)
+    if problem_info:
+        catalog.save_problem(title_slug, problem_info)
+    return problem_info
+
+
+async def _afetch_and_store(title_slug: str) -> Optional[Dict[str, str]]:
+    problem_info = await _batcher.load(title_slug)
+    if problem_info:
+        await asyncio.to_thread(catalog.save_problem, title_slug, problem_info)
+    return problem_info
+
+
+async def aget_problem_info(title_slug: str) -> Optional[Dict[str, str]]:
+    """
+    Async version of get_problem_info for use in async route handlers.
+
+    Args:
+        title_slug: The URL slug of the LeetCode problem (e.g., "two-sum")
+
+    Returns:
+        Dictionary with problem_id, title, difficulty, and tags (comma-separated)
+        Returns None if the problem is unknown and the request fails
+
+    Raises:
+        LeetCodeUnavailableError: If a fetch is needed while LeetCode calls are
+            being refused by the circuit breaker or rate limiter
+    """
+    # Known misses are rejected in memory, before touching the catalog
+    if title_slug in _missing_slugs:
+        return None
+
+    # Catalog reads and writes use the sync engine; keep them off the event loop
+    problem_info = _from_catalog(title_slug, await asyncio.to_thread(catalog.get_problem, title_slug))
+    if problem_info is not None:
+        return problem_info
+
+    return await _async_flights.do(("problem", title_slug), lambda: _afetch_and_store(title_slug))
+
+
+def get_problems_info(
+    title_slugs: List[str],
+    chunk_size: int = LEETCODE_BATCH_SIZE
+) -> Dict[str, Optional[Dict[str, str]]]:
+    """
+    Get information for many problems, consulting the local catalog first.
+
+    Catalog misses are fetched with batched GraphQL requests (chunk_size
+    problems per request) and stored in the catalog.
+
+    Args:
+        title_slugs: URL slugs of the LeetCode problems
+        chunk_size: Number of problems resolved per GraphQL request
+
+    Returns:
+        Dictionary mapping each slug to its problem info, or None if the
+        problem is unknown and could not be fetched
+
+    Raises:
+        LeetCodeUnavailableError: If a fetch is needed while LeetCode calls are
+            being refused by the circuit breaker or rate limiter
+    """
+    results, lookup = _not_known_missing(title_slugs)
+    catalog_entries = catalog.get_problems(lookup)
+    missing = [slug for slug in lookup if slug not in catalog_entries]
+    for slug, cached in catalog_entries.items():
+        results[slug] = _from_catalog(slug, cached)
+
+    found = _merge_fetched(results, missing, fetch_problems_info(missing, chunk_size=chunk_size))
+    if found:
+        catalog.save_problems(found)
+    return results
+
+
+async def aget_problems_info(
+    title_slugs: List[str],
+    chunk_size: int = LEETCODE_BATCH_SIZE
+) -> Dict[str, Optional[Dict[str, str]]]:
+    """
+    Async version of get_problems_info.
+
+    Args:
+        title_slugs: URL slugs of the LeetCode problems
+        chunk_size: Number of problems resolved per GraphQL request
+
+    Returns:
+        Dictionary mapping each slug to its problem info, or None if the
+        problem is unknown and could not be fetched
+
+    Raises:
+        LeetCodeUnavailableError: If a fetch is needed while LeetCode calls are
+            being refused by the circuit breaker or rate limiter
+    """
+    results, lookup = _not_known_missing(title_slugs)
+    catalog_entries = await asyncio.to_thread(catalog.get_problems, lookup)
+    missing = [slug for slug in lookup if slug not in catalog_entries]
+    for slug, cached in catalog_entries.items():
+        results[slug] = _from_catalog(slug, cached)
+
+    found = _merge_fetched(results, missing, await afetch_problems_info(missing, chunk_size=chunk_size))
+    if found:
+        await asyncio.to_thread(catalog.save_problems, found)
+    return results
+
+
+def _schedule_refresh(title_slug: str) -> None:
+    """Re-fetch a stale catalog entry in a background thread."""
+    with _refreshing_lock:
+        if title_slug in _refreshing:
+            return
+        _refreshing.add(title_slug)
+
+    def refresh():
+        try:
+            problem_info = fetch_problem_info(title_slug)
+            if problem_info:
+                catalog.save_problem(title_slug, problem_info)
+        except LeetCodeUnavailableError as e:
+            # Keep serving the stale entry; the next lookup retries
+            print(f"Skipped catalog refresh for '{title_slug}': {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(title_slug)
+
+    threading.Thread(target=refresh, daemon=True).start()
+
+
+def fetch_problem_info(title_slug: str) -> Optional[Dict[str, str]]:
     """
     Fetch problem information from LeetCode GraphQL API.
-    
+
     Args:
         title_slug: The URL slug of the LeetCode problem (e.g., "two-sum")
-    
+
     Returns:
         Dictionary with problem_id, title, difficulty, and tags (comma-separated)
         Returns None if the request fails
     """
-    url = "https://leetcode.com/graphql"
-    
-    # GraphQL query to fetch problem details
-    query = """
-    query getProblemInfo($titleSlug: String!) {
-        question(titleSlug: $titleSlug) {
-            questionFrontendId
-            title
-            difficulty
-            topicTags {
-                name
-            }
-        }
-    }
-    """
-    
-    # Request payload
-    payload = {
-        "query": query,
-        "variables": {"titleSlug": title_slug}
-    }
-    
-    # Headers to mimic a browser request
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Content-Type": "application/json",
-        "Referer": "https://leetcode.com/"
-    }
-    
     try:
-        # Make the POST request
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        # Parse the response
-        data = response.json()
-        question = data.get("data", {}).get("question", {})
-        
-        if not question:
-            print(f"Problem not found: {title_slug}")
-            return None
-        
-        # Extract tags and join them as comma-separated string
-        topic_tags = question.get("topicTags", [])
-        tags_str = ", ".join([tag["name"] for tag in topic_tags])
-        
-        # Return the structured data
-        return {
-            "problem_id": question.get("questionFrontendId", ""),
-            "title": question.get("title", ""),
-            "difficulty": question.get("difficulty", ""),
-            "tags": tags_str
-        }
-    
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching problem info for '{title_slug}': {e}")
+        data = _post(PROBLEM_INFO_QUERY, {"titleSlug": title_slug})
+    except ScraperError as e:
+        _log_fetch_error(e, f"problem info for '{title_slug}'")
         return None
-    except (KeyError, ValueError) as e:
-        print(f"Error parsing response for '{title_slug}': {e}")
+    return _parse_question(title_slug, data)
+
+
+async def afetch_problem_info(title_slug: str) -> Optional[Dict[str, str]]:
+    """
+    Async version of fetch_problem_info.
+
+    Args:
+        title_slug: The URL slug of the LeetCode problem (e.g., "two-sum")
+
+    Returns:
+        Dictionary with problem_id, title, difficulty, and tags (comma-separated)
+        Returns None if the request fails
+    """
+    try:
+        data = await _apost(PROBLEM_INFO_QUERY, {"titleSlug": title_slug})
+    except ScraperError as e:
+        _log_fetch_error(e, f"problem info for '{title_slug}'")
         return None
+    return _parse_question(title_slug, data)
+
+
+def fetch_problems_info(
+    title_slugs: List[str],
+    chunk_size: int = LEETCODE_BATCH_SIZE
+) -> Dict[str, Optional[Dict[str, str]]]:
+    """
+    Fetch many problems from LeetCode with aliased multi-question queries.
+
+    Args:
+        title_slugs: URL slugs of the LeetCode problems
+        chunk_size: Number of problems resolved per GraphQL request
+
+    Returns:
+        Dictionary mapping each slug to its problem info (None if not found).
+        Slugs from chunks whose request failed are left out.
+    """
+    results: Dict[str, Optional[Dict[str, str]]] = {}
+    for chunk in _chunks(list(dict.fromkeys(title_slugs)), chunk_size):
+        variables = {f"s{i}": slug for i, slug in enumerate(chunk)}
+        try:
+            data = _post(_batch_problem_query(len(chunk)), variables)
+        except ScraperError as e:
+            _log_fetch_error(e, f"problem batch ({len(chunk)} problems)")
+            continue
+        results.update(_parse_batch(chunk, data))
+    return results
+
+
+async def afetch_problems_info(
+    title_slugs: List[str],
+    chunk_size: int = LEETCODE_BATCH_SIZE
+) -> Dict[str, Optional[Dict[str, str]]]:
+    """
+    Async version of fetch_problems_info. Chunks are requested concurrently.
+
+    Args:
+        title_slugs: URL slugs of the LeetCode problems
+        chunk_size: Number of problems resolved per GraphQL request
+
+    Returns:
+        Dictionary mapping each slug to its problem info (None if not found).
+        Slugs from chunks whose request failed are left out.
+    """
+    async def fetch_chunk(chunk: List[str]) -> Dict[str, Optional[Dict[str, str]]]:
+        variables = {f"s{i}": slug for i, slug in enumerate(chunk)}
+        try:
+            data = await _apost(_batch_problem_query(len(chunk)), variables)
+        except ScraperError as e:
+            _log_fetch_error(e, f"problem batch ({len(chunk)} problems)")
+            return {}
+        return _parse_batch(chunk, data)
+
+    chunks = _chunks(list(dict.fromkeys(title_slugs)), chunk_size)
+    results: Dict[str, Optional[Dict[str, str]]] = {}
+    for chunk_results in await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks)):
+        results.update(chunk_results)
+    return results
 
 
 def get_slug_from_id(problem_id: str) -> Optional[str]:
     """
-    Fetch the title slug from a LeetCode problem ID using the GraphQL API.
+    Resolve a LeetCode problem ID to its title slug.
+
+    Uses the local ID/slug index and only falls back to the GraphQL API for
+    IDs that are not in the catalog yet.
 
     Args:
         problem_id: Frontend question ID as string (e.g., "1", "54")
 
     Returns:
         The titleSlug if found, otherwise None
+
+    Raises:
+        LeetCodeUnavailableError: If a fetch is needed while LeetCode calls are
+            being refused by the circuit breaker or rate limiter
     """
-    url = "https://leetcode.com/graphql"
-
-    query = """
-    query problemsetQuestionList($categorySlug: String, $limit: Int, $skip: Int, $filters: QuestionListFilterInput) {
-      problemsetQuestionList: questionList(
-        categorySlug: $categorySlug
-        limit: $limit
-        skip: $skip
-        filters: $filters
-      ) {
-        data {
-          titleSlug
-          questionFrontendId
-        }
-      }
-    }
+    if str(problem_id) in _missing_ids:
+        return None
+
+    slug = catalog.get_slug_by_id(problem_id)
+    if slug:
+        return slug
+
+    return _flights.do(("slug", str(problem_id)), lambda: _fetch_and_remember_slug(problem_id))
+
+
+def _fetch_and_remember_slug(problem_id: str) -> Optional[str]:
+    slug = fetch_slug_from_id(problem_id)
+    if slug:
+        catalog.remember_slug(problem_id, slug)
+    return slug
+
+
+async def _afetch_and_remember_slug(problem_id: str) -> Optional[str]:
+    slug = await afetch_slug_from_id(problem_id)
+    if slug:
+        catalog.remember_slug(problem_id, slug)
+    return slug
+
+
+async def aget_slug_from_id(problem_id: str) -> Optional[str]:
     """
+    Async version of get_slug_from_id.
 
-    variables = {
-        "categorySlug": "",
-        "limit": 1,
-        "skip": 0,
-        "filters": {
-            "searchKeywords": str(problem_id)
-        }
-    }
+    Args:
+        problem_id: Frontend question ID as string (e.g., "1", "54")
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Content-Type": "application/json",
-        "Referer": "https://leetcode.com/"
-    }
+    Returns:
+        The titleSlug if found, otherwise None
+
+    Raises:
+        LeetCodeUnavailableError: If a fetch is needed while LeetCode calls are
+            being refused by the circuit breaker or rate limiter
+    """
+    if str(problem_id) in _missing_ids:
+        return None
+
+    slug = await asyncio.to_thread(catalog.get_slug_by_id, problem_id)
+    if slug:
+        return slug
+
+    return await _async_flights.do(("slug", str(problem_id)), lambda: _afetch_and_remember_slug(problem_id))
+
+
+def fetch_slug_from_id(problem_id: str) -> Optional[str]:
+    """
+    Fetch the title slug from a LeetCode problem ID using the GraphQL API.
+
+    Args:
+        problem_id: Frontend question ID as string (e.g., "1", "54")
 
+    Returns:
+        The titleSlug if found, otherwise None
+    """
     try:
-        response = requests.post(
-            url,
-            json={"query": query, "variables": variables},
-            headers=headers,
-            timeout=10
-        )
-        response.raise_for_status()
+        data = _post(SLUG_FROM_ID_QUERY, _slug_search_variables(problem_id))
+    except ScraperError as e:
+        _log_fetch_error(e, f"slug for problem ID '{problem_id}'")
+        return None
+    return _parse_slug_search(problem_id, data)
 
-        data = response.json()
-        items = data.get("data", {}).get("problemsetQuestionList", {}).get("data", [])
-        for item in items:
-            if item.get("questionFrontendId") == str(problem_id):
-                return item.get("titleSlug")
 
-        print(f"Problem ID not found: {problem_id}")
+async def afetch_slug_from_id(problem_id: str) -> Optional[str]:
+    """
+    Async version of fetch_slug_from_id.
+
+    Args:
+        problem_id: Frontend question ID as string (e.g., "1", "54")
+
+    Returns:
+        The titleSlug if found, otherwise None
+    """
+    try:
+        data = await _apost(SLUG_FROM_ID_QUERY, _slug_search_variables(problem_id))
+    except ScraperError as e:
+        _log_fetch_error(e, f"slug for problem ID '{problem_id}'")
         return None
+    return _parse_slug_search(problem_id, data)
 
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching slug for problem ID '{problem_id}': {e}")
+
+def fetch_problemset(page_size: int = 1000) -> Optional[List[Dict]]:
+    """
+    Fetch the full LeetCode problemset using paginated questionList queries.
+
+    Args:
+        page_size: Number of problems requested per page
+
+    Returns:
+        List of dictionaries with slug, problem_id, title, difficulty,
+        tags (comma-separated), and paid_only
+        Returns None if any page fails
+    """
+    problems: List[Dict] = []
+    skip = 0
+
+    try:
+        while True:
+            variables = {
+                "categorySlug": "",
+                "limit": page_size,
+                "skip": skip,
+                "filters": {}
+            }
+            data = _post(PROBLEMSET_QUERY, variables, timeout=30)
+            question_list = data.get("problemsetQuestionList") or {}
+            items = question_list.get("data") or []
+
+            for item in items:
+                problems.append({
+                    "slug": item["titleSlug"],
+                    **_parse_problem_info(item),
+                    "paid_only": bool(item.get("paidOnly", False))
+                })
+
+            skip += len(items)
+            if not items or skip >= question_list.get("total", 0):
+                return problems
+
+    except ScraperError as e:
+        print(f"Error fetching problemset (skip={skip}): {e}")
+        return None
+    except KeyError as e:
+        print(f"Error parsing problemset response (skip={skip}): {e}")
         return None
-    except (KeyError, ValueError) as e:
-        print(f"Error parsing response for problem ID '{problem_id}': {e}")
-        return None
\ No newline at end of file
+
+
+def build_problem_index() -> int:
+    """
+    Populate the catalog and ID/slug index from the full problemset.
+
+    Returns:
+        Number of problems indexed (0 if the fetch failed)
+    """
+    problems = fetch_problemset()
+    if not problems:
+        return 0
+    catalog.sync_problems(problems)
+    # Newly published problems may have been cached as not found
+    _missing_slugs.clear()
+    _missing_ids.clear()
+    return len(problems)
@@ -0,0 +1,308 @@
+"""
+Per-user, per-tag proficiency statistics.
+
+UserTagStat rows are updated incrementally whenever a counted log (enriched
+and not in the trash) is created, changed, trashed, or restored, so skill
+diagnosis is one indexed read covering the user's whole history.
+
+Each attempt adds a weight to the tag's score (INDEPENDENT +1, WITH HINT 0,
+STUCK -1) that halves every TAG_SCORE_HALF_LIFE_DAYS, so recent practice
+counts most. Low scores mark weak topics.
+
+When a catalog update changes a problem's tags, the affected users' rows
+are recomputed (rebuild_for_problems). Rebuild the table from the logs with:
+    python -m backend.stats [--user-id 1]
+"""
+import argparse
+from datetime import datetime, timezone
+from typing import Optional, List, Tuple, Dict, Iterable
+from sqlmodel import Session, select, delete, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .database import (
+    engine,
+    create_db_and_tables,
+    insert_for,
+    Log,
+    ProblemTag,
+    Tag,
+    UserTagStat,
+    PracticeStatus,
+    EnrichmentStatus,
+)
+from .utils.dates import as_utc
+from .config import TAG_SCORE_HALF_LIFE_DAYS
+
+
+STATUS_COUNTERS = {
+    PracticeStatus.INDEPENDENT: "independent_count",
+    PracticeStatus.WITH_HINT: "with_hint_count",
+    PracticeStatus.STUCK: "stuck_count",
+}
+
+STATUS_WEIGHTS = {
+    PracticeStatus.INDEPENDENT: 1.0,
+    PracticeStatus.WITH_HINT: 0.0,
+    PracticeStatus.STUCK: -1.0,
+}
+
+
+def _decay(seconds: float) -> float:
+    return 0.5 ** (seconds / (TAG_SCORE_HALF_LIFE_DAYS * 86400))
+
+
+def is_counted(log: Log) -> bool:
+    """Whether a log contributes to the statistics."""
+    return not log.is_deleted and log.enrichment_status == EnrichmentStatus.DONE
+
+
+def _apply(stat: UserTagStat, status: PracticeStatus, practice_date: datetime, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) one attempt from a stat row in memory."""
+    counter = STATUS_COUNTERS[status]
+    setattr(stat, counter, getattr(stat, counter) + sign)
+    stat.attempts += sign
+
+    # The score is kept as of its latest attempt; older contributions are
+    # decayed to that point, so attempts can be added or removed in any order
+    practiced_at = as_utc(practice_date)
+    as_of = as_utc(stat.score_as_of) if stat.score_as_of else practiced_at
+    new_as_of = max(as_of, practiced_at)
+    stat.score = (
+        stat.score * _decay((new_as_of - as_of).total_seconds())
+        + sign * STATUS_WEIGHTS[status] * _decay((new_as_of - practiced_at).total_seconds())
+    )
+    stat.score_as_of = new_as_of
+
+    if sign > 0 and (stat.last_practiced is None or practiced_at > as_utc(stat.last_practiced)):
+        stat.last_practiced = practiced_at
+
+
+def current_score(stat: UserTagStat, now: Optional[datetime] = None) -> float:
+    """
+    Decay a stat row's score to the present.
+
+    Args:
+        stat: Stat row
+        now: Reference time (defaults to the current time)
+
+    Returns:
+        The tag's score as of now
+    """
+    if stat.score_as_of is None:
+        return 0.0
+    now = now or datetime.now(timezone.utc)
+    return stat.score * _decay(max((now - as_utc(stat.score_as_of)).total_seconds(), 0.0))
+
+
+async def _update(
+    session: AsyncSession,
+    user_id: int,
+    problem_slug: Optional[str],
+    status: PracticeStatus,
+    practice_date: datetime,
+    sign: int
+) -> None:
+    if not problem_slug:
+        return
+
+    tag_ids = (await session.exec(
+        select(ProblemTag.tag_id).where(ProblemTag.problem_slug == problem_slug)
+    )).all()
+    if not tag_ids:
+        return
+
+    if sign > 0:
+        # FOR UPDATE can't lock rows that don't exist yet, so create them first;
+        # a concurrent first insert for the same tag is then a no-op, not an IntegrityError
+        await session.exec(
+            insert_for(session)(UserTagStat)
+            .values([{"user_id": user_id, "tag_id": tag_id} for tag_id in tag_ids])
+            .on_conflict_do_nothing(index_elements=["user_id", "tag_id"])
+        )
+
+    statement = (
+        select(UserTagStat)
+        .where(UserTagStat.user_id == user_id, UserTagStat.tag_id.in_(tag_ids))
+        .with_for_update()
+    )
+    existing = {stat.tag_id: stat for stat in (await session.exec(statement)).all()}
+
+    for tag_id in tag_ids:
+        stat = existing.get(tag_id)
+        if stat is None:
+            continue  # Never counted under this tag; nothing to take back
+        _apply(stat, status, practice_date, sign)
+        session.add(stat)
+
+    if sign < 0:
+        await _refresh_last_practiced(session, user_id, tag_ids, existing)
+
+
+async def _refresh_last_practiced(
+    session: AsyncSession,
+    user_id: int,
+    tag_ids: List[int],
+    stats_by_tag: Dict[int, UserTagStat]
+) -> None:
+    """Recompute last_practiced after a removal (the removed log may have been the latest)."""
+    statement = (
+        select(ProblemTag.tag_id, func.max(Log.practice_date))
+        .join(Log, Log.problem_slug == ProblemTag.problem_slug)
+        .where(
+            Log.user_id == user_id,
+            Log.is_deleted == False,
+            Log.enrichment_status == EnrichmentStatus.DONE,
+            ProblemTag.tag_id.in_(tag_ids)
+        )
+        .group_by(ProblemTag.tag_id)
+    )
+    latest = dict((await session.exec(statement)).all())
+    for tag_id, stat in stats_by_tag.items():
+        stat.last_practiced = latest.get(tag_id)
+
+
+async def add_log(session: AsyncSession, log: Log) -> None:
+    """
+    Count a log in its user's tag statistics (in the caller's transaction).
+
+    Args:
+        session: Database session
+        log: Log that just became counted (created, enriched, or restored)
+    """
+    await _update(session, log.user_id, log.problem_slug, log.status, log.practice_date, 1)
+
+
+async def remove_log(
+    session: AsyncSession,
+    log: Log,
+    status: Optional[PracticeStatus] = None,
+    practice_date: Optional[datetime] = None
+) -> None:
+    """
+    Take a log out of its user's tag statistics (in the caller's transaction).
+
+    Args:
+        session: Database session
+        log: Log that stops being counted (trashed, or about to be re-added after an edit)
+        status: Status the log was counted with, if it has changed since
+        practice_date: Practice date the log was counted with, if it has changed since
+    """
+    await _update(
+        session,
+        log.user_id,
+        log.problem_slug,
+        status or log.status,
+        practice_date or log.practice_date,
+        -1
+    )
+
+
+async def get_tag_stats(session: AsyncSession, user_id: int) -> List[Tuple[str, UserTagStat]]:
+    """
+    Read a user's per-tag statistics.
+
+    Args:
+        session: Database session
+        user_id: User ID
+
+    Returns:
+        (tag name, stat row) pairs for every tag the user has practiced
+    """
+    statement = (
+        select(Tag.name, UserTagStat)
+        .join(UserTagStat, UserTagStat.tag_id == Tag.id)
+        .where(UserTagStat.user_id == user_id, UserTagStat.attempts > 0)
+    )
+    return (await session.exec(statement)).all()
+
+
+def _rebuild(session: Session, user_ids: Optional[List[int]] = None) -> int:
+    """Recompute tag statistics in the caller's transaction (all users if user_ids is None)."""
+    statement = (
+        select(Log.user_id, ProblemTag.tag_id, Log.status, Log.practice_date)
+        .join(ProblemTag, ProblemTag.problem_slug == Log.problem_slug)
+        .where(Log.is_deleted == False, Log.enrichment_status == EnrichmentStatus.DONE)
+        .order_by(Log.practice_date)
+    )
+    if user_ids is not None:
+        statement = statement.where(Log.user_id.in_(user_ids))
+
+    stats: Dict[Tuple[int, int], UserTagStat] = {}
+    for log_user_id, tag_id, status, practice_date in session.exec(statement).all():
+        stat = stats.get((log_user_id, tag_id))
+        if stat is None:
+            stat = stats[(log_user_id, tag_id)] = UserTagStat(user_id=log_user_id, tag_id=tag_id)
+        _apply(stat, status, practice_date, 1)
+
+    purge = delete(UserTagStat)
+    if user_ids is not None:
+        purge = purge.where(UserTagStat.user_id.in_(user_ids))
+    session.exec(purge)
+    session.add_all(stats.values())
+    return len(stats)
+
+
+def rebuild(user_id: Optional[int] = None) -> int:
+    """
+    Recompute tag statistics from the logs.
+
+    Args:
+        user_id: Only rebuild this user's rows (all users if None)
+
+    Returns:
+        Number of stat rows written
+    """
+    with Session(engine) as session:
+        count = _rebuild(session, None if user_id is None else [user_id])
+        session.commit()
+    return count
+
+
+def rebuild_for_problems(session: Session, problem_slugs: Iterable[str]) -> None:
+    """
+    Recompute the statistics of every user with counted logs of these
+    problems (in the caller's transaction), after their tags changed.
+
+    Args:
+        session: Database session
+        problem_slugs: Problems whose tag links changed or that received logs
+    """
+    problem_slugs = list(problem_slugs)
+    if not problem_slugs:
+        return
+
+    statement = (
+        select(Log.user_id)
+        .where(
+            Log.problem_slug.in_(problem_slugs),
+            Log.is_deleted == False,
+            Log.enrichment_status == EnrichmentStatus.DONE
+        )
+        .distinct()
+    )
+    user_ids = session.exec(statement).all()
+    if user_ids:
+        _rebuild(session, list(user_ids))
+
+
+def ensure_built() -> None:
+    """Build the statistics once for databases that have logs but no stat rows yet."""
+    with Session(engine) as session:
+        if session.exec(select(UserTagStat.user_id).limit(1)).first() is not None:
+            return
+        if session.exec(select(Log.id).limit(1)).first() is None:
+            return
+    print(f"Tag statistics built: {rebuild()} row(s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild per-user, per-tag practice statistics.")
+    parser.add_argument("--user-id", type=int, help="Only rebuild this user's statistics")
+    args = parser.parse_args()
+
+    create_db_and_tables()
+    count = rebuild(args.user_id)
+    print(f"Tag statistics rebuilt: {count} row(s)")
+
+
+if __name__ == "__main__":
+    main()
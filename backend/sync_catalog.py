@@ -0,0 +1,46 @@
+"""
+Bulk LeetCode catalog sync.
+
+Pulls the whole problemset in large pages and writes it into the local
+Problem catalog in one transaction.
+
+Usage:
+    python -m backend.sync_catalog [--full] [--page-size 1000]
+"""
+import argparse
+from .database import create_db_and_tables
+from . import scraper, catalog
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sync the local LeetCode problem catalog.")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Rewrite every catalog row instead of only the changed ones"
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=1000,
+        help="Number of problems requested per questionList page"
+    )
+    args = parser.parse_args()
+
+    create_db_and_tables()
+
+    print(f"Fetching problemset from LeetCode (page size {args.page_size})...")
+    problems = scraper.fetch_problemset(page_size=args.page_size)
+    if not problems:
+        raise SystemExit("Catalog sync failed: could not fetch the problemset")
+
+    stats = catalog.sync_problems(problems, full=args.full)
+    print(
+        f"Catalog synced: {len(problems)} problems "
+        f"({stats['inserted']} inserted, {stats['updated']} updated, "
+        f"{stats['unchanged']} unchanged, {stats['removed']} removed)"
+    )
+
+
+if __name__ == "__main__":
+    main()
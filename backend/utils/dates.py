@@ -0,0 +1,11 @@
+"""
+Datetime helpers.
+"""
+from datetime import datetime, timezone
+
+
+def as_utc(value: datetime) -> datetime:
+    """SQLite returns naive datetimes; treat them as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
@@ -0,0 +1,169 @@
+"""
+Incremental scanning of a JSON object that arrives in chunks (e.g., a
+streamed LLM response).
+
+Each top-level member is reported as soon as its value is complete, and
+each element of a top-level array as soon as that element is complete, so
+callers can act on partial output without waiting for the whole document.
+Text before the opening brace (such as a ``` fence) is ignored.
+"""
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class JsonObjectStream:
+    """
+    Feed text chunks with feed(); it returns the events completed by them:
+
+        ("item", key, value)   an element of the top-level array `key`
+        ("field", key, value)  a complete top-level member (arrays included)
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}  # Completed members; arrays hold the items seen so far
+        self.errors: List[str] = []  # Values that could not be decoded (skipped)
+        self.closed = False  # The closing brace has been seen
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._in_array = False
+        self._item_start: Optional[int] = None
+        self._after_colon = False
+
+    @property
+    def started(self) -> bool:
+        """Whether the opening brace has been seen."""
+        return self._depth > 0 or bool(self.fields)
+
+    def feed(self, text: str) -> List[Tuple[str, str, Any]]:
+        """
+        Scan another chunk.
+
+        Args:
+            text: Next piece of the document
+
+        Returns:
+            Events completed by this chunk, in document order
+        """
+        self._buffer += text
+        events: List[Tuple[str, str, Any]] = []
+
+        while self._pos < len(self._buffer):
+            pos = self._pos
+            char = self._buffer[pos]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = self._decode(self._buffer[self._key_start:pos + 1])
+                        self._key_start = None
+                continue
+
+            if char.isspace():
+                continue
+
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                continue
+
+            self._mark_value_start(char, pos)
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._value_start is None and not self._after_colon:
+                    self._key_start = pos
+            elif char == ":" and self._depth == 1:
+                self._after_colon = True
+            elif char in "{[":
+                self._depth += 1
+                if char == "[" and self._depth == 2 and self._value_start == pos:
+                    self._in_array = True
+                    self.fields[self._key] = []
+            elif char == "," or char in "}]":
+                if self._in_array and self._depth == 2:
+                    self._end_item(pos, events)
+                if char == "," and self._depth == 1:
+                    self._end_member(pos, events)
+                elif char in "}]":
+                    self._depth -= 1
+                    if self._in_array and self._depth == 1:
+                        self._in_array = False
+                        events.append(("field", self._key, self.fields[self._key]))
+                        self._reset_member()
+                    elif self._depth == 0:
+                        self._end_member(pos, events)
+                        self.closed = True
+
+        return events
+
+    def _mark_value_start(self, char: str, pos: int) -> None:
+        if self._depth == 1 and self._after_colon and self._value_start is None:
+            self._value_start = pos
+            self._after_colon = False
+        elif self._in_array and self._depth == 2 and self._item_start is None and char not in ",]":
+            self._item_start = pos
+
+    def _end_item(self, pos: int, events: List[Tuple[str, str, Any]]) -> None:
+        if self._item_start is None:
+            return
+        raw = self._buffer[self._item_start:pos]
+        self._item_start = None
+        value = self._decode(raw)
+        if value is not None:
+            self.fields[self._key].append(value)
+            events.append(("item", self._key, value))
+
+    def _end_member(self, pos: int, events: List[Tuple[str, str, Any]]) -> None:
+        if self._key is not None and self._value_start is not None and not self._in_array:
+            value = self._decode(self._buffer[self._value_start:pos])
+            if value is not None or self._buffer[self._value_start:pos].strip() == "null":
+                self.fields[self._key] = value
+                events.append(("field", self._key, value))
+        self._reset_member()
+
+    def _reset_member(self) -> None:
+        self._key = None
+        self._value_start = None
+        self._after_colon = False
+
+    def _decode(self, raw: str) -> Any:
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            self.errors.append(raw.strip())
+            return None
+
+
+def parse_object(text: str) -> Tuple[Dict[str, Any], bool]:
+    """
+    Parse a JSON object, salvaging what it can from truncated or malformed output.
+
+    Args:
+        text: Model output expected to hold one JSON object
+
+    Returns:
+        (members, complete): complete is False when members were salvaged,
+        in which case arrays hold only their well-formed elements
+    """
+    try:
+        data = json.loads(text)
+        if isinstance(data, dict):
+            return data, True
+    except json.JSONDecodeError:
+        pass
+
+    parser = JsonObjectStream()
+    parser.feed(text)
+    return parser.fields, False
@@ -0,0 +1,34 @@
+"""
+Opaque cursors for keyset pagination over (practice_date, key), where key is
+a log ID or, for grouped listings, a problem ID.
+"""
+import base64
+from datetime import datetime
+from typing import Callable, Tuple, TypeVar, Union
+
+K = TypeVar("K")
+
+
+def encode_cursor(practice_date: datetime, key: Union[int, str]) -> str:
+    """Encode the sort key of the last row on a page as a URL-safe cursor."""
+    raw = f"{practice_date.isoformat()}|{key}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_type: Callable[[str], K] = int) -> Tuple[datetime, K]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous page
+        key_type: Converts the encoded key back (int for log IDs, str for problem IDs)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        practice_date, key = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(practice_date), key_type(key)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor '{cursor}'") from e
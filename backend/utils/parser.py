@@ -5,7 +5,7 @@ from fastapi import HTTPException
 from .. import scraper
 
 
-def parse_problem_input(user_input: str) -> str:
+async def parse_problem_input(user_input: str) -> str:
     """
     Parse problem input and extract the slug.
     
@@ -22,6 +22,8 @@ def parse_problem_input(user_input: str) -> str:
         
     Raises:
         HTTPException: 400 for invalid format, 404 if problem not found
+        scraper.LeetCodeUnavailableError: If an unknown ID needs a LeetCode
+            call while outbound calls are being refused (served as 503)
     """
     problem_input = user_input.strip()
     
@@ -44,7 +46,7 @@ def parse_problem_input(user_input: str) -> str:
     
     # Case 2: Numeric ID
     elif problem_input.isdigit():
-        slug = scraper.get_slug_from_id(problem_input)
+        slug = await scraper.aget_slug_from_id(problem_input)
         if not slug:
             raise HTTPException(
                 status_code=404, 
@@ -0,0 +1,218 @@
+"""
+Rate limiting, concurrency limiting, and circuit breaking for calls to
+external services.
+"""
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter shared across threads and coroutines.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def reserve(self, max_wait: float = 0.0) -> Optional[float]:
+        """
+        Reserve one token.
+
+        Args:
+            max_wait: Longest delay (seconds) the caller is willing to wait
+
+        Returns:
+            Seconds the caller must wait before proceeding (0 if a token is
+            available now), or None if no token frees up within max_wait.
+            When a delay is returned the token is already reserved.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+
+            wait = (1 - self._tokens) / self.rate if self.rate > 0 else float("inf")
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "rate_per_second": self.rate,
+                "capacity": self.capacity,
+                "available_tokens": round(max(self._tokens, 0.0), 2)
+            }
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker: after `failure_threshold` consecutive failures the
+    circuit opens and calls fail fast for `reset_timeout` seconds. Then a
+    single trial call is let through (half-open); its outcome closes or
+    re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._open_for = reset_timeout
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        if self._state == self.OPEN and now - self._opened_at >= self._open_for:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed now."""
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def abandon_trial(self) -> None:
+        """Forget an admitted call that ended without an outcome (e.g., cancelled)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._failures += 1
+            if self._current_state(now) == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._open(now, self.reset_timeout)
+
+    def trip(self, open_for: Optional[float] = None) -> None:
+        """Open the circuit immediately (e.g., on an explicit rate-limit response)."""
+        with self._lock:
+            self._open(time.monotonic(), max(open_for or 0.0, self.reset_timeout))
+
+    def _open(self, now: float, open_for: float) -> None:
+        self._state = self.OPEN
+        self._opened_at = now
+        self._open_for = open_for
+        self._trial_in_flight = False
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            retry_in = max(self._open_for - (now - self._opened_at), 0.0) if state == self.OPEN else 0.0
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout_seconds": self.reset_timeout,
+                "retry_in_seconds": round(retry_in, 2)
+            }
+
+
+class LimiterRejected(Exception):
+    """Raised when a ConcurrencyLimiter turns a call away."""
+
+    def __init__(self, message: str, queue_full: bool):
+        super().__init__(message)
+        self.queue_full = queue_full  # False: waited too long for a slot
+
+
+class ConcurrencyLimiter:
+    """
+    Caps concurrent calls from coroutines at `max_concurrency`. At most
+    `max_queue` callers may wait for a slot, each for at most
+    `queue_timeout` seconds; others are rejected right away.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0
+        self._in_flight = 0
+
+    def check(self) -> None:
+        """
+        Reject early if a call started now would be turned away for a full queue.
+
+        Raises:
+            LimiterRejected: If every slot is taken and the queue is full
+        """
+        if self._semaphore.locked() and self._waiting >= self.max_queue:
+            raise LimiterRejected(f"{self._waiting} calls already waiting", queue_full=True)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Hold one slot for the duration of the block.
+
+        Raises:
+            LimiterRejected: If the queue is full or no slot frees up in time
+        """
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()  # A slot is free: returns without waiting
+        else:
+            self.check()
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise LimiterRejected(f"no slot free within {self.queue_timeout:g}s", queue_full=False)
+            finally:
+                self._waiting -= 1
+
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "max_queue": self.max_queue,
+            "waiting": self._waiting,
+            "queue_timeout_seconds": self.queue_timeout
+        }
@@ -5,6 +5,7 @@ This module handles all HTTP communication with the FastAPI backend.
 No Streamlit code should be present in this file.
 """
 
+import json
 import requests
 
 # Backend API base URL
@@ -71,6 +72,8 @@ def create_log(username: str, problem_slug: str, status: str, note: str):
             timeout=10
         )
         if response.status_code == 200:
+            if response.json().get("enrichment_status") == "PENDING":
+                return True, "Log saved! Problem details will be filled in shortly."
             return True, "Log saved successfully!"
         else:
             error_detail = response.json().get("detail", response.text)
@@ -112,6 +115,26 @@ def get_user_logs(user_id: int):
         return []
 
 
+def get_log_groups_page(user_id: int, limit: int, cursor: str | None = None, trash: bool = False):
+    """Get one page of the user's logs grouped per problem (or None on failure)"""
+    try:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        path = "logs/trash/grouped" if trash else "logs/grouped"
+        response = requests.get(
+            f"{API_BASE_URL}/users/{user_id}/{path}",
+            params=params,
+            timeout=5
+        )
+        if response.status_code == 200:
+            return response.json()
+        else:
+            return None
+    except requests.exceptions.RequestException:
+        return None
+
+
 def delete_log(log_id: int):
     """Delete a specific practice log"""
     try:
@@ -230,10 +253,65 @@ def get_recommendations(
         return False, f"Connection error: {str(e)}"
 
 
-def get_ai_hints(problem_title: str):
-    """Get AI-generated hints for a specific problem"""
+def _stream_events(path: str, payload: dict):
+    """POST to a Server-Sent Events endpoint and yield (event, data) pairs as they arrive"""
+    try:
+        with requests.post(f"{API_BASE_URL}{path}", json=payload, stream=True, timeout=(5, 60)) as response:
+            if response.status_code != 200:
+                error_detail = response.json().get("detail", response.text)
+                yield "error", {"detail": f"Error: {error_detail}"}
+                return
+
+            event = "message"
+            for line in response.iter_lines(decode_unicode=True):
+                if not line:
+                    event = "message"
+                elif line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:"):
+                    yield event, json.loads(line[len("data:"):])
+    except requests.exceptions.RequestException as e:
+        yield "error", {"detail": f"Connection error: {str(e)}"}
+
+
+def stream_recommendations(
+    username: str,
+    tags: list,
+    difficulty: str,
+    count: int,
+    target_companies: list[str] | None = None,
+    exclude_problems: list[str] | None = None
+):
+    """Stream AI-powered recommendations: yields ("advice" | "recommendation" | "done" | "error", data)"""
+    payload = {
+        "username": username,
+        "tags": tags,
+        "difficulty": difficulty,
+        "count": count,
+        "target_companies": target_companies,
+        "exclude_problems": exclude_problems or []
+    }
+    yield from _stream_events("/recommendations/stream", payload)
+
+
+def stream_ai_hints(problem_title: str, problem_id: int | None = None, regenerate: bool = False):
+    """Stream AI-generated hints: yields ("hint" | "done" | "error", data)"""
+    payload = {
+        "problem_title": problem_title,
+        "problem_id": problem_id,
+        "regenerate": regenerate
+    }
+    yield from _stream_events("/recommendations/hints/stream", payload)
+
+
+def get_ai_hints(problem_title: str, problem_id: int | None = None, regenerate: bool = False):
+    """Get AI-generated hints for a specific problem (regenerate bypasses the hint cache)"""
     try:
-        payload = {"problem_title": problem_title}
+        payload = {
+            "problem_title": problem_title,
+            "problem_id": problem_id,
+            "regenerate": regenerate
+        }
         response = requests.post(
             f"{API_BASE_URL}/recommendations/hints",
             json=payload,
@@ -1,6 +1,6 @@
 import re
 import streamlit as st
-from api_client import get_recommendations, get_ai_hints
+from api_client import stream_recommendations, stream_ai_hints
 
 
 TARGET_COMPANIES = [
@@ -28,7 +28,7 @@ def normalize_title(title: str) -> str:
     return title.strip().lower()
 
 
-def render_ai_hints(problem_title: str, idx: int) -> None:
+def render_ai_hints(problem_title: str, idx: int, problem_id: int | None = None) -> None:
     hints_key = f"hints_{idx}_{problem_title.replace(' ', '_')}"
     has_hints = hints_key in st.session_state and st.session_state[hints_key]
 
@@ -36,13 +36,25 @@ def render_ai_hints(problem_title: str, idx: int) -> None:
     with hint_col1:
         button_label = "🔄 Ask AI Again" if has_hints else "✨ Ask AI for Hints"
         if st.button(button_label, key=f"hint_btn_{idx}_{problem_title.replace(' ', '_')}", use_container_width=True):
+            hints = []
+            error = None
+            # Show each hint as soon as it arrives instead of waiting for all three
+            preview = st.empty()
             with st.spinner("Generating AI hints..."):
-                success, hints, message = get_ai_hints(problem_title)
-                if success:
-                    st.session_state[hints_key] = hints
-                    st.rerun()
-                else:
-                    st.error(message)
+                for event, data in stream_ai_hints(problem_title, problem_id, regenerate=has_hints):
+                    if event == "hint":
+                        hints.append(data["hint"])
+                        with preview.container():
+                            for hint_idx, hint in enumerate(hints, 1):
+                                st.write(f"**Hint {hint_idx}:** {clean_hint_text(hint)}")
+                    elif event == "error":
+                        error = data.get("detail", "Failed to generate hints")
+            if hints:
+                st.session_state[hints_key] = hints
+                st.rerun()
+            else:
+                preview.empty()
+                st.error(error or "Failed to generate hints")
 
     if has_hints:
         hints = st.session_state[hints_key]
@@ -81,7 +93,7 @@ def render_problem_card(idx: int, problem: dict) -> None:
             use_container_width=True
         )
 
-    render_ai_hints(title, idx)
+    render_ai_hints(title, idx, problem_id)
     st.markdown("---")
 
 
@@ -167,18 +179,30 @@ def show_ai_coach() -> None:
         for key in keys_to_clear:
             del st.session_state[key]
 
-        with st.status("AI is analyzing your practice history and generating recommendations..."):
-            success, result = get_recommendations(
+        result = {"advice": "", "recommendations": []}
+        error = None
+        with st.status("AI is analyzing your practice history and generating recommendations...") as status:
+            # Render advice and problems as they stream in; full cards appear on rerun
+            for event, data in stream_recommendations(
                 st.session_state.username,
                 final_tags,
                 difficulty,
                 count,
                 target_companies,
                 list(st.session_state.seen_problems)
-            )
-
-        if not success:
-            st.error(f"Failed to get recommendations: {result}")
+            ):
+                if event == "advice":
+                    result["advice"] = data["advice"]
+                    st.info(result["advice"])
+                elif event == "recommendation":
+                    result["recommendations"].append(data)
+                    st.write(f"✅ {data.get('title', 'Untitled')} ({data.get('difficulty', '')})")
+                elif event == "error":
+                    error = data.get("detail")
+            status.update(state="error" if error else "complete")
+
+        if error and not result["recommendations"]:
+            st.error(f"Failed to get recommendations: {error}")
             st.session_state.recommendations = None
             return
 
@@ -189,6 +213,7 @@ def show_ai_coach() -> None:
             if problem.get("title")
         }
         st.session_state.seen_problems.update(new_titles)
+        st.rerun()
 
     if not st.session_state.recommendations:
         return
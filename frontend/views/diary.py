@@ -130,7 +130,7 @@ def show_write_diary() -> None:
             st.session_state.notes_input.strip()
         )
         if success:
-            st.toast("✅ Log saved successfully!")
+            st.toast(f"✅ {message}")
             st.session_state.problem_input = ""
             st.session_state.notes_input = ""
             st.session_state.current_preview = None
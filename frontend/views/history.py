@@ -1,23 +1,27 @@
 import streamlit as st
 from datetime import datetime
-from api_client import get_user_logs, delete_log
+from api_client import get_log_groups_page, delete_log
 from components.dialogs import edit_log_dialog
 
 
-def _group_logs_by_problem(logs: list[dict]) -> dict[str, list[dict]]:
-    from collections import defaultdict
-    grouped_logs: dict[str, list[dict]] = defaultdict(list)
-    for log in logs:
-        grouped_logs[log['problem_id']].append(log)
-    return grouped_logs
+HISTORY_PAGE_SIZE = 50  # Problem groups per page
 
 
-def _sorted_attempts(problem_logs: list[dict]) -> list[dict]:
-    return sorted(
-        problem_logs,
-        key=lambda x: datetime.fromisoformat(x["practice_date"].replace("Z", "+00:00")),
-        reverse=True
-    )
+def _load_history(user_id: int, pages: int) -> tuple[dict | None, list[dict], bool]:
+    """Fetch the newest `pages` pages of problem groups; also report whether more remain."""
+    first_page = None
+    groups: list[dict] = []
+    cursor = None
+    for _ in range(pages):
+        page = get_log_groups_page(user_id, HISTORY_PAGE_SIZE, cursor)
+        if page is None:
+            break
+        first_page = first_page or page
+        groups.extend(page["groups"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    return first_page, groups, cursor is not None
 
 
 def _render_attempt_row(log: dict) -> None:
@@ -54,36 +58,31 @@ def _render_attempt_row(log: dict) -> None:
             st.write("*No notes*")
 
 
-def _render_problem_group(problem_logs_sorted: list[dict]) -> None:
-    if not problem_logs_sorted:
-        return
-
-    first_log = problem_logs_sorted[0]
+def _render_problem_group(group: dict) -> None:
     diff_color = {
         "Easy": "🟢",
         "Medium": "🟡",
         "Hard": "🔴"
-    }.get(first_log["difficulty"], "⚪")
-    total_attempts = len(problem_logs_sorted)
+    }.get(group["difficulty"], "⚪")
 
     with st.expander(
-        f"{diff_color} {first_log['problem_id']}. **{first_log['problem_title']}**",
+        f"{diff_color} {group['problem_id']}. **{group['problem_title']}**",
         expanded=False
     ):
         col1, col2, _ = st.columns([1, 1, 3])
         with col1:
-            st.metric("Total Attempts", total_attempts)
+            st.metric("Total Attempts", group["attempt_count"])
         with col2:
-            st.metric("Difficulty", first_log["difficulty"])
+            st.metric("Difficulty", group["difficulty"])
 
-        st.write(f"**Tags:** {first_log['tags']}")
+        st.write(f"**Tags:** {group['tags']}")
 
         st.markdown("---")
         st.markdown("### 📜 Attempt History")
 
-        for idx, log in enumerate(problem_logs_sorted, 1):
+        for idx, log in enumerate(group["logs"], 1):
             _render_attempt_row(log)
-            if idx < len(problem_logs_sorted):
+            if idx < len(group["logs"]):
                 st.markdown("---")
 
 
@@ -91,16 +90,21 @@ def show_history() -> None:
     """History page"""
     st.header("📊 Practice History")
 
+    if "history_pages" not in st.session_state:
+        st.session_state.history_pages = 1
+
     with st.spinner("Loading your practice history..."):
-        logs = get_user_logs(st.session_state.user_id)
+        first_page, groups, has_more = _load_history(st.session_state.user_id, st.session_state.history_pages)
 
-    if not logs:
+    if not groups:
         st.info("No practice logs found. Start logging your practice sessions!")
         return
 
-    st.success(f"Found {len(logs)} practice logs across {len(set(log['problem_id'] for log in logs))} unique problems")
+    st.success(f"Found {first_page['total_logs']} practice logs across {first_page['total_problems']} unique problems")
+
+    for group in groups:
+        _render_problem_group(group)
 
-    grouped_logs = _group_logs_by_problem(logs)
-    for problem_logs in grouped_logs.values():
-        problem_logs_sorted = _sorted_attempts(problem_logs)
-        _render_problem_group(problem_logs_sorted)
+    if has_more and st.button("Load more problems", key="history_load_more"):
+        st.session_state.history_pages += 1
+        st.rerun()
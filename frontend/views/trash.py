@@ -1,22 +1,26 @@
 import streamlit as st
 from datetime import datetime
-from api_client import get_trash_logs, restore_log, empty_trash
+from api_client import get_log_groups_page, restore_log, empty_trash
 
 
-def _group_logs_by_problem(logs: list[dict]) -> dict[str, list[dict]]:
-    from collections import defaultdict
-    grouped_logs: dict[str, list[dict]] = defaultdict(list)
-    for log in logs:
-        grouped_logs[log['problem_id']].append(log)
-    return grouped_logs
+TRASH_PAGE_SIZE = 50  # Problem groups per page
 
 
-def _sorted_attempts(problem_logs: list[dict]) -> list[dict]:
-    return sorted(
-        problem_logs,
-        key=lambda x: datetime.fromisoformat(x["practice_date"].replace("Z", "+00:00")),
-        reverse=True
-    )
+def _load_trash(user_id: int, pages: int) -> tuple[dict | None, list[dict], bool]:
+    """Fetch the newest `pages` pages of trashed problem groups; also report whether more remain."""
+    first_page = None
+    groups: list[dict] = []
+    cursor = None
+    for _ in range(pages):
+        page = get_log_groups_page(user_id, TRASH_PAGE_SIZE, cursor, trash=True)
+        if page is None:
+            break
+        first_page = first_page or page
+        groups.extend(page["groups"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    return first_page, groups, cursor is not None
 
 
 def _render_trash_attempt(log: dict) -> None:
@@ -50,29 +54,25 @@ def _render_trash_attempt(log: dict) -> None:
             st.write("*No notes*")
 
 
-def _render_trash_group(problem_logs_sorted: list[dict]) -> None:
-    if not problem_logs_sorted:
-        return
-
-    first_log = problem_logs_sorted[0]
+def _render_trash_group(group: dict) -> None:
     diff_color = {
         "Easy": "🟢",
         "Medium": "🟡",
         "Hard": "🔴"
-    }.get(first_log["difficulty"], "⚪")
+    }.get(group["difficulty"], "⚪")
 
     with st.expander(
-        f"{diff_color} {first_log['problem_id']}. **{first_log['problem_title']}**",
+        f"{diff_color} {group['problem_id']}. **{group['problem_title']}**",
         expanded=False
     ):
-        st.write(f"**Tags:** {first_log['tags']}")
+        st.write(f"**Tags:** {group['tags']}")
 
         st.markdown("---")
         st.markdown("### 📜 Deleted Attempts")
 
-        for idx, log in enumerate(problem_logs_sorted, 1):
+        for idx, log in enumerate(group["logs"], 1):
             _render_trash_attempt(log)
-            if idx < len(problem_logs_sorted):
+            if idx < len(group["logs"]):
                 st.markdown("---")
 
 
@@ -81,14 +81,17 @@ def show_trash_bin() -> None:
     st.header("🗑️ Trash Bin")
     st.markdown("Deleted logs can be restored from here")
 
+    if "trash_pages" not in st.session_state:
+        st.session_state.trash_pages = 1
+
     with st.spinner("Loading trash..."):
-        trash_logs = get_trash_logs(st.session_state.user_id)
+        first_page, groups, has_more = _load_trash(st.session_state.user_id, st.session_state.trash_pages)
 
-    if not trash_logs:
+    if not groups:
         st.info("🎉 Trash is empty! All your logs are safe and sound.")
         return
 
-    st.warning(f"Found {len(trash_logs)} deleted log(s)")
+    st.warning(f"Found {first_page['total_logs']} deleted log(s)")
 
     # Empty Trash button
     if st.button("🗑️ Empty Trash Permanently", type="primary", help="Permanently delete all items in trash"):
@@ -102,7 +105,9 @@ def show_trash_bin() -> None:
 
     st.markdown("---")
 
-    grouped_trash = _group_logs_by_problem(trash_logs)
-    for problem_logs in grouped_trash.values():
-        problem_logs_sorted = _sorted_attempts(problem_logs)
-        _render_trash_group(problem_logs_sorted)
+    for group in groups:
+        _render_trash_group(group)
+
+    if has_more and st.button("Load more problems", key="trash_load_more"):
+        st.session_state.trash_pages += 1
+        st.rerun()
@@ -0,0 +1,93 @@
+"""
+Streaming hint delivery under AI call overload.
+"""
+import asyncio
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+import pytest
+
+from backend import ai_service
+from backend.utils.resilience import ConcurrencyLimiter
+
+
+class _Chunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class _FakeModels:
+    def __init__(self, parts):
+        self.parts = parts
+
+    async def generate_content_stream(self, model, contents, config):
+        async def stream():
+            for part in self.parts:
+                yield _Chunk(part)
+        return stream()
+
+
+class _FakeClient:
+    def __init__(self, parts):
+        self.aio = type("Aio", (), {"models": _FakeModels(parts)})()
+
+
+@pytest.fixture
+def fake_gemini(monkeypatch):
+    monkeypatch.setattr(ai_service, "client", _FakeClient(['{"hints": ["a", ', '"b", "c"]}']))
+    monkeypatch.setattr(ai_service, "_limiter", ConcurrencyLimiter(1, 1, 0.05))
+
+    async def no_put(*args):
+        pass
+
+    monkeypatch.setattr(ai_service.hint_cache, "put", no_put)
+
+
+async def _collect(events):
+    return [event async for event in events]
+
+
+def test_stream_hints(fake_gemini):
+    async def run():
+        return await _collect(await ai_service.stream_problem_hints("Two Sum", regenerate=True))
+
+    events = asyncio.run(run())
+    assert [data["hint"] for event, data in events if event == "hint"] == ["a", "b", "c"]
+    assert events[-1] == ("done", {"cached": False})
+
+
+def test_stream_hints_reports_queue_timeout(fake_gemini):
+    async def run():
+        async with ai_service._limiter.slot():
+            return await _collect(await ai_service.stream_problem_hints("Two Sum", regenerate=True))
+
+    events = asyncio.run(run())
+    assert [event for event, _ in events] == ["error"]
+    assert events[0][1]["status"] == 503
+
+
+def test_stream_hints_rejects_full_queue_up_front(fake_gemini):
+    async def run():
+        async with ai_service._limiter.slot():
+            waiter = asyncio.create_task(_collect(await ai_service.stream_problem_hints("A", regenerate=True)))
+            await asyncio.sleep(0.01)  # The waiter now holds the only queue place
+            try:
+                with pytest.raises(ai_service.LimiterRejected) as rejected:
+                    await ai_service.stream_problem_hints("B", regenerate=True)
+            finally:
+                await waiter
+        return rejected.value
+
+    assert asyncio.run(run()).queue_full
+
+
+@pytest.mark.parametrize("queue_full, status", [(True, 429), (False, 503)])
+def test_overload_status(queue_full, status):
+    from backend import main
+
+    exc = ai_service.LimiterRejected("busy", queue_full=queue_full)
+    response = asyncio.run(main.ai_overloaded_handler(None, exc))
+    assert response.status_code == status
+    assert response.headers["Retry-After"] == "5"
+    assert ai_service._busy_event(exc)["status"] == status
@@ -0,0 +1,36 @@
+"""
+Incremental JSON scanning and salvage of truncated model output.
+"""
+from backend.utils.json_stream import JsonObjectStream, parse_object
+
+
+def test_stream_reports_items_and_fields_as_they_complete():
+    parser = JsonObjectStream()
+    assert parser.feed('```json\n{"hints": ["a", ') == [("item", "hints", "a")]
+    assert parser.feed('"b"], "x": 1') == [("item", "hints", "b"), ("field", "hints", ["a", "b"])]
+    assert not parser.closed
+    assert parser.feed("}") == [("field", "x", 1)]
+    assert parser.closed
+    assert parser.fields == {"hints": ["a", "b"], "x": 1}
+
+
+def test_stream_handles_braces_and_quotes_inside_strings():
+    parser = JsonObjectStream()
+    parser.feed('{"hints": ["use {a, b}", "say \\"hi\\""]}')
+    assert parser.fields == {"hints": ["use {a, b}", 'say "hi"']}
+
+
+def test_parse_object_complete():
+    assert parse_object('{"hints": ["a", "b"]}') == ({"hints": ["a", "b"]}, True)
+
+
+def test_parse_object_salvages_truncated_output():
+    assert parse_object('{"hints": ["a", "b", "c') == ({"hints": ["a", "b"]}, False)
+
+
+def test_parse_object_skips_malformed_elements():
+    assert parse_object('{"hints": ["a", {bad}, "c"], "n": 2}') == ({"hints": ["a", "c"], "n": 2}, False)
+
+
+def test_parse_object_without_an_object():
+    assert parse_object("no json here") == ({}, False)
@@ -0,0 +1,113 @@
+"""
+Keyset pagination of log listings.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend import database
+from backend.database import EnrichmentStatus, Log, PracticeStatus, User
+from backend.routers.users import _list_log_groups, _list_logs
+
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# id, problem_id, problem_slug, days after START, enrichment status
+LOGS = [
+    (1, "1", "two-sum", 0, EnrichmentStatus.DONE),
+    (2, "1", "two-sum", 3, EnrichmentStatus.DONE),
+    (3, "2", "add-two-numbers", 1, EnrichmentStatus.DONE),
+    (4, "3", "longest-substring", 3, EnrichmentStatus.DONE),  # Same date as log 2
+    (5, "", "pending-slug", 2, EnrichmentStatus.PENDING),
+    (6, "", None, 4, EnrichmentStatus.FAILED),
+]
+
+
+@pytest.fixture
+def async_engine(tmp_path):
+    url = f"sqlite:///{tmp_path / 'solvenext.db'}"
+    engine = database._create_engine(url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(User(id=1, username="alice"))
+        session.add(Log(id=99, user_id=1, problem_id="1", problem_title="Two Sum", difficulty="Easy",
+                        status=PracticeStatus.INDEPENDENT, practice_date=START, is_deleted=True))
+        for log_id, problem_id, slug, days, enrichment_status in LOGS:
+            session.add(Log(
+                id=log_id,
+                user_id=1,
+                problem_id=problem_id,
+                problem_title=slug or "unknown",
+                difficulty="Easy",
+                status=PracticeStatus.INDEPENDENT,
+                practice_date=START + timedelta(days=days),
+                problem_slug=slug,
+                enrichment_status=enrichment_status
+            ))
+        session.commit()
+    engine.dispose()
+
+    async_engine = database._create_async_engine(url)
+    yield async_engine
+    asyncio.run(async_engine.dispose())
+
+
+def _pages(async_engine, list_page, key):
+    async def run():
+        pages = []
+        cursor = None
+        async with AsyncSession(async_engine) as session:
+            while True:
+                page = await list_page(session, 1, False, 2, cursor)
+                pages.append([key(item) for item in getattr(page, "items", None) or page.groups])
+                cursor = page.next_cursor
+                if cursor is None:
+                    return pages
+    return asyncio.run(run())
+
+
+def test_list_logs_pages_newest_first(async_engine):
+    pages = _pages(async_engine, _list_logs, lambda log: log.id)
+    assert pages == [[6, 4], [2, 5], [3, 1]]
+
+
+def test_list_logs_without_limit(async_engine):
+    async def run():
+        async with AsyncSession(async_engine) as session:
+            return await _list_logs(session, 1, True, None, None)
+
+    assert [log.id for log in asyncio.run(run())] == [99]
+
+
+def test_list_logs_rejects_bad_cursor(async_engine):
+    async def run():
+        async with AsyncSession(async_engine) as session:
+            await _list_logs(session, 1, False, 2, "not-a-cursor")
+
+    with pytest.raises(HTTPException) as rejected:
+        asyncio.run(run())
+    assert rejected.value.status_code == 400
+
+
+def test_list_log_groups_pages_by_latest_practice(async_engine):
+    pages = _pages(async_engine, _list_log_groups, lambda group: [log.id for log in group.logs])
+    # Pending logs group by slug; a log with neither ID nor slug stands alone
+    assert pages == [[[6], [4]], [[2, 1], [5]], [[3]]]
+
+
+def test_list_log_groups_totals(async_engine):
+    async def run():
+        async with AsyncSession(async_engine) as session:
+            return await _list_log_groups(session, 1, False, 10, None)
+
+    page = asyncio.run(run())
+    assert (page.total_logs, page.total_problems, page.next_cursor) == (6, 5, None)
+    two_sum = next(group for group in page.groups if group.problem_id == "1")
+    assert (two_sum.attempt_count, two_sum.first_practiced, two_sum.last_practiced) == (
+        2, START, START + timedelta(days=3)
+    )
+
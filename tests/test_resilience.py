@@ -0,0 +1,148 @@
+"""
+Rate limiting, circuit breaking and concurrency limiting.
+"""
+import asyncio
+
+import pytest
+
+from backend.utils import resilience
+from backend.utils.resilience import CircuitBreaker, ConcurrencyLimiter, LimiterRejected, TokenBucket
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(resilience.time, "monotonic", clock)
+    return clock
+
+
+def test_token_bucket_spends_then_refills(clock):
+    bucket = TokenBucket(rate=2, capacity=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() is None
+
+    clock.now += 0.5
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() is None
+
+
+def test_token_bucket_reserves_ahead_within_max_wait(clock):
+    bucket = TokenBucket(rate=2, capacity=1)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve(max_wait=1.0) == pytest.approx(0.5)
+    # The reserved token is spent: the next caller queues behind it
+    assert bucket.reserve(max_wait=1.0) == pytest.approx(1.0)
+    assert bucket.reserve(max_wait=1.0) is None
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_breaker_success_resets_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_half_open_admits_one_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+
+    clock.now += 30
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_breaker_failed_trial_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 29
+    assert not breaker.allow()
+
+
+def test_breaker_abandoned_trial_frees_the_slot(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+
+    breaker.abandon_trial()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+
+
+def test_breaker_trip_honours_longer_retry_after(clock):
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+    breaker.trip(open_for=120)
+    clock.now += 60
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 60
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_limiter_rejects_full_queue():
+    async def run():
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=1, queue_timeout=1)
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter.slot():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        assert limiter.snapshot()["waiting"] == 1
+
+        with pytest.raises(LimiterRejected) as rejected:
+            async with limiter.slot():
+                pass
+        release.set()
+        await asyncio.gather(holder, waiter)
+        return rejected.value, limiter.snapshot()
+
+    rejected, snapshot = asyncio.run(run())
+    assert rejected.queue_full
+    assert snapshot["in_flight"] == 0 and snapshot["waiting"] == 0
+
+
+def test_limiter_times_out_queued_caller():
+    async def run():
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=1, queue_timeout=0.01)
+        async with limiter.slot():
+            with pytest.raises(LimiterRejected) as rejected:
+                async with limiter.slot():
+                    pass
+        return rejected.value, limiter.snapshot()
+
+    rejected, snapshot = asyncio.run(run())
+    assert not rejected.queue_full
+    assert snapshot["waiting"] == 0
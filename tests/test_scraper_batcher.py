@@ -0,0 +1,56 @@
+"""
+Folding concurrent single-problem lookups into batched requests.
+"""
+import asyncio
+
+import pytest
+
+from backend import scraper
+
+
+@pytest.fixture
+def batch_calls(monkeypatch):
+    calls = []
+
+    async def fake_fetch(title_slugs, chunk_size=None):
+        calls.append(list(title_slugs))
+        return {slug: {"title_slug": slug} for slug in title_slugs if slug != "unknown"}
+
+    monkeypatch.setattr(scraper, "afetch_problems_info", fake_fetch)
+    return calls
+
+
+def test_batcher_groups_lookups_within_window(batch_calls):
+    async def run():
+        batcher = scraper._ProblemBatcher(window_seconds=0.01, max_batch=10)
+        return await asyncio.gather(*(batcher.load(slug) for slug in ["a", "b", "a", "unknown"]))
+
+    results = asyncio.run(run())
+    assert batch_calls == [["a", "b", "unknown"]]
+    assert results == [{"title_slug": "a"}, {"title_slug": "b"}, {"title_slug": "a"}, None]
+
+
+def test_batcher_flushes_full_batch_early(batch_calls):
+    async def run():
+        batcher = scraper._ProblemBatcher(window_seconds=60, max_batch=2)
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.load(slug) for slug in ["a", "b"])),
+            timeout=1
+        )
+
+    assert asyncio.run(run()) == [{"title_slug": "a"}, {"title_slug": "b"}]
+    assert batch_calls == [["a", "b"]]
+
+
+def test_batcher_fails_every_waiter(monkeypatch):
+    async def failing_fetch(title_slugs, chunk_size=None):
+        raise scraper.LeetCodeUnavailableError("circuit open")
+
+    monkeypatch.setattr(scraper, "afetch_problems_info", failing_fetch)
+
+    async def run():
+        batcher = scraper._ProblemBatcher(window_seconds=0.01, max_batch=10)
+        return await asyncio.gather(batcher.load("a"), batcher.load("b"), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, scraper.LeetCodeUnavailableError) for result in results)
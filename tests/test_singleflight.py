@@ -0,0 +1,85 @@
+"""
+Coalescing of concurrent identical calls.
+"""
+import asyncio
+import threading
+
+import pytest
+
+from backend.utils.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def test_single_flight_shares_one_call():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return "result"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.do("key", work)))
+    leader.start()
+    started.wait(timeout=5)
+    followers = [threading.Thread(target=lambda: results.append(flights.do("key", work))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(timeout=5)
+
+    assert calls == [1]
+    assert results == ["result"] * 4
+
+
+def test_single_flight_forgets_finished_calls():
+    flights = SingleFlight()
+    assert flights.do("key", lambda: 1) == 1
+    assert flights.do("key", lambda: 2) == 2
+
+
+def test_single_flight_propagates_errors():
+    flights = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flights.do("key", fail)
+    assert flights.do("key", lambda: "recovered") == "recovered"
+
+
+def test_async_single_flight_shares_one_call():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def run():
+        flights = AsyncSingleFlight()
+        return await asyncio.gather(*(flights.do("key", work) for _ in range(4)))
+
+    assert asyncio.run(run()) == ["result"] * 4
+    assert calls == [1]
+
+
+def test_async_single_flight_survives_cancelled_caller():
+    async def work():
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def run():
+        flights = AsyncSingleFlight()
+        first = asyncio.create_task(flights.do("key", work))
+        second = asyncio.create_task(flights.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "result"
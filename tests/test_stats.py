@@ -0,0 +1,73 @@
+"""
+Decayed per-tag scores.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend import stats
+from backend.database import PracticeStatus, UserTagStat
+
+
+DAY = timedelta(days=1)
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def half_life(monkeypatch):
+    monkeypatch.setattr(stats, "TAG_SCORE_HALF_LIFE_DAYS", 30.0)
+
+
+def _stat():
+    return UserTagStat(user_id=1, tag_id=1)
+
+
+def test_apply_counts_attempts():
+    stat = _stat()
+    stats._apply(stat, PracticeStatus.INDEPENDENT, START, 1)
+    stats._apply(stat, PracticeStatus.STUCK, START + DAY, 1)
+    assert (stat.attempts, stat.independent_count, stat.stuck_count) == (2, 1, 1)
+    assert stat.last_practiced == START + DAY
+
+
+def test_older_attempt_is_decayed_to_latest():
+    stat = _stat()
+    stats._apply(stat, PracticeStatus.INDEPENDENT, START + 30 * DAY, 1)
+    stats._apply(stat, PracticeStatus.STUCK, START, 1)
+    assert stat.score == pytest.approx(1 - 0.5)
+    assert stat.score_as_of == START + 30 * DAY
+    assert stat.last_practiced == START + 30 * DAY
+
+
+def test_newer_attempt_decays_existing_score():
+    stat = _stat()
+    stats._apply(stat, PracticeStatus.INDEPENDENT, START, 1)
+    stats._apply(stat, PracticeStatus.INDEPENDENT, START + 60 * DAY, 1)
+    assert stat.score == pytest.approx(0.25 + 1)
+
+
+def test_remove_undoes_add_in_any_order():
+    stat = _stat()
+    stats._apply(stat, PracticeStatus.INDEPENDENT, START, 1)
+    stats._apply(stat, PracticeStatus.STUCK, START + 10 * DAY, 1)
+    stats._apply(stat, PracticeStatus.INDEPENDENT, START + 20 * DAY, 1)
+    stats._apply(stat, PracticeStatus.STUCK, START + 10 * DAY, -1)
+
+    expected = _stat()
+    stats._apply(expected, PracticeStatus.INDEPENDENT, START, 1)
+    stats._apply(expected, PracticeStatus.INDEPENDENT, START + 20 * DAY, 1)
+    assert stat.score == pytest.approx(expected.score)
+    assert (stat.attempts, stat.stuck_count) == (2, 0)
+
+
+def test_naive_dates_are_treated_as_utc():
+    stat = _stat()
+    stats._apply(stat, PracticeStatus.INDEPENDENT, datetime(2024, 1, 1), 1)
+    assert stat.score_as_of == START
+
+
+def test_current_score_decays_to_now():
+    stat = _stat()
+    stats._apply(stat, PracticeStatus.INDEPENDENT, START, 1)
+    assert stats.current_score(stat, now=START + 30 * DAY) == pytest.approx(0.5)
+    assert stats.current_score(_stat(), now=START) == 0.0
@@ -0,0 +1,97 @@
+"""
+Upgrading a database created by the original (pre-catalog) schema.
+"""
+import sqlite3
+
+import pytest
+from sqlalchemy import inspect
+from sqlmodel import Session, select
+
+from backend import database
+from backend.database import Log, Problem, ProblemTag, Tag
+
+
+BASELINE_SCHEMA = """
+CREATE TABLE user (
+    id INTEGER NOT NULL,
+    username VARCHAR NOT NULL,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id)
+);
+CREATE UNIQUE INDEX ix_user_username ON user (username);
+CREATE TABLE log (
+    id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    problem_id VARCHAR NOT NULL,
+    problem_title VARCHAR NOT NULL,
+    difficulty VARCHAR NOT NULL,
+    tags VARCHAR NOT NULL,
+    practice_date DATETIME NOT NULL,
+    attempt_count INTEGER NOT NULL,
+    status VARCHAR(11) NOT NULL,
+    note VARCHAR,
+    time_spent INTEGER,
+    is_deleted BOOLEAN NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(user_id) REFERENCES user (id)
+);
+"""
+
+BASELINE_LOGS = [
+    # id, problem_id, problem_title, difficulty, tags, is_deleted
+    (1, "1", "Two Sum", "Easy", "Array, Hash Table", 0),
+    (2, "50", "Pow(x, n)", "Medium", "Math, Recursion", 0),
+    (3, "1", "Two Sum", "Easy", "Array, Hash Table", 1),
+]
+
+
+@pytest.fixture
+def baseline_engine(tmp_path, monkeypatch):
+    path = tmp_path / "solvenext.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.execute("INSERT INTO user VALUES (1, 'alice', '2024-01-01 00:00:00')")
+    conn.executemany(
+        "INSERT INTO log VALUES (?, 1, ?, ?, ?, ?, '2024-01-02 00:00:00', 1, 'INDEPENDENT', NULL, NULL, ?)",
+        BASELINE_LOGS
+    )
+    conn.commit()
+    conn.close()
+
+    engine = database._create_engine(f"sqlite:///{path}")
+    monkeypatch.setattr(database, "engine", engine)
+    yield engine
+    engine.dispose()
+
+
+def test_upgrade_keeps_log_tags(baseline_engine):
+    database.create_db_and_tables()
+
+    columns = {column["name"] for column in inspect(baseline_engine).get_columns("log")}
+    assert "tags" not in columns
+    assert "problem_slug" in columns
+
+    with Session(baseline_engine) as session:
+        logs = {log.id: log for log in session.exec(select(Log)).all()}
+        assert {log_id: log.tags for log_id, log in logs.items()} == {
+            log_id: tags for log_id, _, _, _, tags, _ in BASELINE_LOGS
+        }
+        assert logs[1].problem_slug == logs[3].problem_slug == "two-sum"
+        assert logs[2].problem_slug == "powx-n"
+
+        problem = session.get(Problem, "powx-n")
+        assert problem.frontend_id == "50"
+        assert problem.title == "Pow(x, n)"
+
+        linked = session.exec(
+            select(Tag.name).join(ProblemTag, ProblemTag.tag_id == Tag.id).where(ProblemTag.problem_slug == "two-sum")
+        ).all()
+        assert sorted(linked) == ["Array", "Hash Table"]
+
+
+def test_upgrade_is_idempotent(baseline_engine):
+    database.create_db_and_tables()
+    database.create_db_and_tables()
+
+    with Session(baseline_engine) as session:
+        assert len(session.exec(select(Problem)).all()) == 2
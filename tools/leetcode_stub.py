@@ -0,0 +1,200 @@
+"""
+Local stand-in for the LeetCode GraphQL endpoint.
+
+Answers the queries sent by backend/scraper.py (getProblemInfo, the batched
+getProblemsInfo, and problemsetQuestionList) from a recorded catalog file,
+with injectable latency and error rates. Point the backend at it with:
+
+    LEETCODE_GRAPHQL_URL=http://127.0.0.1:8100/graphql
+
+Usage:
+    python -m tools.leetcode_stub serve [--port 8100] [--latency-ms 150] [--error-rate 0.05]
+    python -m tools.leetcode_stub record [--catalog tools/fixtures/leetcode_catalog.json]
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+DEFAULT_CATALOG = Path(__file__).parent / "fixtures" / "leetcode_catalog.json"
+
+# Matches aliased lookups in batched queries, e.g. "q0: question(titleSlug: $s0)"
+ALIASED_QUESTION = re.compile(r"(\w+)\s*:\s*question\(\s*titleSlug:\s*\$(\w+)\s*\)")
+OPERATION_NAME = re.compile(r"query\s+(\w+)")
+
+
+def load_catalog(path: Path) -> List[Dict]:
+    """Load recorded questions (LeetCode questionList item shape) from a JSON file."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def create_app(
+    questions: List[Dict],
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    error_rate: float = 0.0,
+    rate_limit_rate: float = 0.0
+) -> FastAPI:
+    """
+    Build the stand-in GraphQL app.
+
+    Args:
+        questions: Recorded questions to serve
+        latency_ms: Base delay added to every response
+        jitter_ms: Random extra delay in [0, jitter_ms]
+        error_rate: Fraction of requests answered with HTTP 503
+        rate_limit_rate: Fraction of requests answered with HTTP 429
+
+    Returns:
+        FastAPI application exposing POST /graphql
+    """
+    by_slug = {q["titleSlug"]: q for q in questions}
+    stats = {"requests": 0, "errors": 0, "rate_limited": 0}
+    app = FastAPI(title="LeetCode GraphQL stand-in")
+
+    def question_fields(question: Dict) -> Dict:
+        return {
+            "questionFrontendId": question["questionFrontendId"],
+            "title": question["title"],
+            "difficulty": question["difficulty"],
+            "topicTags": question.get("topicTags", [])
+        }
+
+    def question_list(variables: Dict) -> Dict:
+        filters = variables.get("filters") or {}
+        keywords = str(filters.get("searchKeywords", "")).strip().lower()
+        items = questions
+        if keywords:
+            items = [
+                q for q in questions
+                if keywords == q["questionFrontendId"]
+                or keywords in q["title"].lower()
+                or keywords in q["titleSlug"]
+            ]
+
+        skip = variables.get("skip") or 0
+        limit = variables.get("limit")
+        page = items[skip:] if limit is None or limit < 0 else items[skip:skip + limit]
+        return {
+            "total": len(items),
+            "data": [
+                {
+                    "titleSlug": q["titleSlug"],
+                    "paidOnly": q.get("isPaidOnly", False),
+                    **question_fields(q)
+                }
+                for q in page
+            ]
+        }
+
+    @app.post("/graphql")
+    async def graphql(request: Request):
+        stats["requests"] += 1
+        delay = latency_ms + random.uniform(0, jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if random.random() < rate_limit_rate:
+            stats["rate_limited"] += 1
+            return JSONResponse(status_code=429, content={"errors": ["rate limited"]}, headers={"Retry-After": "5"})
+        if random.random() < error_rate:
+            stats["errors"] += 1
+            return JSONResponse(status_code=503, content={"errors": ["injected failure"]})
+
+        body = await request.json()
+        query = body.get("query", "")
+        variables = body.get("variables") or {}
+        match = OPERATION_NAME.search(query)
+        operation = match.group(1) if match else ""
+
+        if operation == "getProblemInfo":
+            question = by_slug.get(variables.get("titleSlug"))
+            return {"data": {"question": question_fields(question) if question else None}}
+
+        if operation == "getProblemsInfo":
+            data: Dict[str, Optional[Dict]] = {}
+            for alias, variable in ALIASED_QUESTION.findall(query):
+                question = by_slug.get(variables.get(variable))
+                data[alias] = question_fields(question) if question else None
+            return {"data": data}
+
+        if operation == "problemsetQuestionList":
+            return {"data": {"problemsetQuestionList": question_list(variables)}}
+
+        return JSONResponse(status_code=400, content={"errors": [f"Unsupported operation '{operation}'"]})
+
+    @app.get("/stats")
+    def get_stats():
+        """Request counters, useful when measuring scraper caching."""
+        return stats
+
+    return app
+
+
+def record(path: Path) -> None:
+    """Record the live LeetCode problemset into a catalog file."""
+    from backend import scraper
+
+    problems = scraper.fetch_problemset()
+    if not problems:
+        raise SystemExit("Recording failed: could not fetch the problemset")
+
+    questions = [
+        {
+            "questionFrontendId": p["problem_id"],
+            "titleSlug": p["slug"],
+            "title": p["title"],
+            "difficulty": p["difficulty"],
+            "isPaidOnly": p["paid_only"],
+            "topicTags": [{"name": tag} for tag in p["tags"].split(", ") if tag]
+        }
+        for p in problems
+    ]
+    with open(path, "w") as f:
+        json.dump(questions, f, indent=2)
+    print(f"Recorded {len(questions)} problems to {path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local LeetCode GraphQL stand-in server.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Serve the recorded catalog")
+    serve_parser.add_argument("--catalog", type=Path, default=DEFAULT_CATALOG)
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8100)
+    serve_parser.add_argument("--latency-ms", type=float, default=0.0)
+    serve_parser.add_argument("--jitter-ms", type=float, default=0.0)
+    serve_parser.add_argument("--error-rate", type=float, default=0.0)
+    serve_parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+
+    record_parser = subparsers.add_parser("record", help="Record the live problemset to a catalog file")
+    record_parser.add_argument("--catalog", type=Path, default=DEFAULT_CATALOG)
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.catalog)
+        return
+
+    import uvicorn
+
+    app = create_app(
+        load_catalog(args.catalog),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate
+    )
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()